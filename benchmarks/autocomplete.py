@@ -0,0 +1,117 @@
+"""Latency of GET /autocomplete under concurrent typing.
+
+Usage: python -m benchmarks.autocomplete --clients 32 --duration 20
+       python -m benchmarks.autocomplete --no-cache
+
+Seeds the full-text benchmark catalog, then each client types random
+titles a character at a time, requesting suggestions on every keystroke
+like a search box. Prints req/s and latency percentiles as JSON. With
+--no-cache the response cache is cleared before every request so each
+keystroke reaches the database.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks import full_text_search, load
+from benchmarks.common import bench_engine, percentile, prepare_schema
+from madr.app import app
+from madr.config.security import create_access_token
+from madr.utils.response_cache import response_cache
+
+
+def random_title(rng: random.Random) -> str:
+    first = rng.choice(full_text_search.FIRST)
+    second = rng.choice(full_text_search.SECOND)
+    return f'{first} {second} {rng.randint(1, 999)}'
+
+
+async def type_titles(  # noqa: PLR0913, PLR0917
+    client: AsyncClient,
+    headers: dict,
+    deadline: float,
+    samples: list,
+    seed_value: int,
+    cache: bool,
+):
+    rng = random.Random(seed_value)
+    while time.perf_counter() < deadline:
+        title = random_title(rng)
+        for end in range(1, len(title) + 1):
+            if not cache:
+                response_cache.clear()
+            start = time.perf_counter()
+            response = await client.get(
+                '/autocomplete',
+                params={'q': title[:end]},
+                headers=headers,
+            )
+            samples.append((
+                (time.perf_counter() - start) * 1000,
+                response.is_success,
+            ))
+
+
+async def main(args: argparse.Namespace):
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+        await full_text_search.seed(conn, args.rows)
+    async with AsyncSession(engine) as session:
+        await load.seed(session, 1, 0)
+    await engine.dispose()
+
+    token = create_access_token({'sub': load.EMAIL})
+    headers = {'Authorization': f'Bearer {token}'}
+
+    samples = []
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        # Warm the user cache, or every first request also needs a
+        # connection of its own to load the account
+        await c.get('/autocomplete', params={'q': 'a'}, headers=headers)
+
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(
+                type_titles(
+                    c, headers, deadline, samples, i, not args.no_cache
+                )
+                for i in range(args.clients)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in samples]
+    print(
+        json.dumps(
+            {
+                'clients': args.clients,
+                'cache': not args.no_cache,
+                'requests': len(samples),
+                'errors': sum(not ok for _, ok in samples),
+                'rps': round(len(samples) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 50), 3),
+                'p95_ms': round(percentile(latencies, 95), 3),
+                'p99_ms': round(percentile(latencies, 99), 3),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--no-cache', action='store_true')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,53 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from madr.config.settings import Settings
+from madr.data.models import table_registry
+
+BENCH_NOVELIST = 'benchmark novelist'
+
+
+def bench_engine():
+    return create_async_engine(Settings().DATABASE_URL)
+
+
+async def prepare_schema(conn: AsyncConnection):
+    await conn.run_sync(table_registry.metadata.create_all)
+
+
+async def seed_books(conn: AsyncConnection, rows: int) -> int:
+    author_id = await conn.scalar(
+        text(
+            'INSERT INTO novelists (name, name_key) VALUES (:name, :name) '
+            'ON CONFLICT (name_key) DO UPDATE SET name = EXCLUDED.name '
+            'RETURNING id'
+        ),
+        {'name': BENCH_NOVELIST},
+    )
+    existing = await conn.scalar(
+        text('SELECT count(*) FROM books WHERE author_id = :author_id'),
+        {'author_id': author_id},
+    )
+
+    if existing < rows:
+        await conn.execute(
+            text(
+                'INSERT INTO books (title, title_key, year, author_id) '
+                "SELECT 'benchmark ' || md5(i::text), "
+                "'benchmark ' || md5(i::text), "
+                '1900 + i % 200, :author_id '
+                'FROM generate_series(:start, :stop) AS i'
+            ),
+            {'author_id': author_id, 'start': existing + 1, 'stop': rows},
+        )
+        await conn.execute(text('ANALYZE books'))
+
+    return author_id
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
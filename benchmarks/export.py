@@ -0,0 +1,100 @@
+"""Rows per second and peak RSS of the streaming book export.
+
+Usage: python -m benchmarks.export --rows 1000000 [--url http://host:8000]
+
+Without --url the export generator is drained in-process, which measures
+the app side of the stream. With --url (and --token) the body is streamed
+from a running server.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+from time import perf_counter
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import bench_engine, prepare_schema, seed_books
+from madr.data import bulk
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def drain_in_process(engine, fmt: str, include_author: bool):
+    total_bytes = 0
+    lines = 0
+    async with AsyncSession(engine) as session:
+        async for chunk in bulk.export_books(session, fmt, include_author):
+            total_bytes += len(chunk)
+            lines += chunk.count(b'\n')
+    return lines, total_bytes
+
+
+async def drain_server(url: str, token: str, fmt: str, include_author: bool):
+    total_bytes = 0
+    lines = 0
+    async with AsyncClient(base_url=url, timeout=None) as client:
+        async with client.stream(
+            'GET',
+            '/books/export',
+            params={'format': fmt, 'include_author': include_author},
+            headers={'Authorization': f'Bearer {token}'},
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                total_bytes += len(chunk)
+                lines += chunk.count(b'\n')
+    return lines, total_bytes
+
+
+async def main(args):
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+        await seed_books(conn, args.rows)
+
+    rss_before = peak_rss_mb()
+    start = perf_counter()
+    if args.url:
+        lines, total_bytes = await drain_server(
+            args.url, args.token, args.format, args.include_author
+        )
+    else:
+        lines, total_bytes = await drain_in_process(
+            engine, args.format, args.include_author
+        )
+    elapsed = perf_counter() - start
+
+    await engine.dispose()
+
+    rows = lines - (1 if args.format == 'csv' else 0)
+    print(
+        json.dumps(
+            {
+                'rows': rows,
+                'megabytes': round(total_bytes / 1024 / 1024, 1),
+                'seconds': round(elapsed, 2),
+                'rows_per_second': round(rows / elapsed),
+                'peak_rss_mb_before': round(rss_before, 1),
+                'peak_rss_mb_after': round(peak_rss_mb(), 1),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument(
+        '--format', choices=['ndjson', 'csv'], default='ndjson'
+    )
+    parser.add_argument('--include-author', action='store_true')
+    parser.add_argument('--url')
+    parser.add_argument('--token', default='')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,159 @@
+"""Latency of the ranked /search query over a large catalog.
+
+Usage: python -m benchmarks.full_text_search --rows 1000000 --repeat 50
+
+Seeds ROWS books whose titles mix Portuguese words (idempotent), then runs
+the query behind GET /search for terms of different selectivity and prints
+matches, plan and median/p95 latency as JSON. Runs against
+Settings().DATABASE_URL; use a scratch database.
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+from benchmarks.common import bench_engine, percentile, prepare_schema
+from benchmarks.trigram_search import explain, plan_nodes
+from madr.data.search import ranked_matches
+from madr.utils.pagination import paginate
+
+NOVELIST = 'search benchmark novelist'
+FIRST = (
+    'coração', 'memórias', 'sertão', 'noite', 'mar', 'amor', 'cidade',
+    'casa', 'rio', 'sol', 'viagem', 'caminho', 'sombra', 'luz', 'tempo',
+    'história', 'segredo', 'jardim', 'silêncio', 'estrela',
+)  # fmt: skip
+SECOND = (
+    'perdido', 'esquecido', 'distante', 'eterno', 'antigo', 'escuro',
+    'secreto', 'último', 'infinito', 'azul', 'quieto', 'selvagem',
+    'profundo', 'breve', 'amargo', 'dourado', 'frio', 'estranho',
+    'sagrado', 'vazio', 'feliz', 'triste', 'novo',
+)  # fmt: skip
+TERMS = (
+    'coracao',
+    'memorias esquecidas',
+    'estrela dourada',
+    'jardim sagrado',
+    '"caminho antigo" -noite',
+    'amor 12345',
+    'quixotesco',
+)
+
+
+async def seed(conn, rows: int) -> int:
+    author_id = await conn.scalar(
+        text(
+            'INSERT INTO novelists (name, name_key) VALUES (:name, :name) '
+            'ON CONFLICT (name_key) DO UPDATE SET name = EXCLUDED.name '
+            'RETURNING id'
+        ),
+        {'name': NOVELIST},
+    )
+    existing = await conn.scalar(
+        text('SELECT count(*) FROM books WHERE author_id = :author_id'),
+        {'author_id': author_id},
+    )
+
+    if existing < rows:
+        # The titles hold only letters, digits and spaces, where lower and
+        # unaccent give the same key as normalize_key
+        await conn.execute(
+            text(
+                'INSERT INTO books (title, title_key, year, author_id) '
+                'SELECT title, lower(unaccent(title)), 1850 + i % 175, '
+                ':author_id FROM ('
+                'SELECT i, (CAST(:first AS text[]))[1 + i % :first_count] '
+                "|| ' ' || (CAST(:second AS text[]))"
+                '[1 + (i / :first_count) % :second_count] '
+                "|| ' ' || i AS title "
+                'FROM generate_series(:start, :stop) AS i) AS generated'
+            ),
+            {
+                'author_id': author_id,
+                'first': list(FIRST),
+                'first_count': len(FIRST),
+                'second': list(SECOND),
+                'second_count': len(SECOND),
+                'start': existing + 1,
+                'stop': rows,
+            },
+        )
+        await conn.execute(text('ANALYZE books'))
+
+    return author_id
+
+
+def search_sql(term: str, limit: int) -> str:
+    matches = ranked_matches(term)
+    query = paginate(
+        select(matches),
+        (matches.c.rank, matches.c.type, matches.c.id),
+        limit,
+        descending=True,
+    )
+    return str(
+        query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={'literal_binds': True},
+        )
+    )
+
+
+async def measure(conn, term: str, limit: int, repeat: int) -> dict:
+    sql = search_sql(term, limit)
+    matches = await conn.scalar(
+        select(func.count()).select_from(ranked_matches(term))
+    )
+
+    await conn.execute(text(sql))
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        await conn.execute(text(sql))
+        timings.append((perf_counter() - start) * 1000)
+
+    plan = await explain(conn, sql)
+    return {
+        'matches': matches,
+        'median_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'execution_ms': round(plan['Execution Time'], 3),
+        'plan': ' -> '.join(plan_nodes(plan['Plan'])),
+    }
+
+
+async def main(args: argparse.Namespace):
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+        await seed(conn, args.rows)
+
+    async with engine.connect() as conn:
+        total = await conn.scalar(text('SELECT count(*) FROM books'))
+        results = {
+            term: await measure(conn, term, args.limit, args.repeat)
+            for term in TERMS
+        }
+
+    await engine.dispose()
+
+    print(
+        json.dumps(
+            {'books': total, 'limit': args.limit, 'terms': results},
+            indent=2,
+            ensure_ascii=False,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50)
+
+    asyncio.run(main(parser.parse_args()))
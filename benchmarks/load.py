@@ -0,0 +1,257 @@
+"""Closed-loop load test over a weighted mix of routes.
+
+Usage: python -m benchmarks.load --clients 16 --duration 30
+       python -m benchmarks.load --url http://localhost:8000 --no-seed
+
+Seeds a catalog through the models (idempotent), then runs N concurrent
+clients that each log in once and pick requests from the mix until the
+duration ends. Without --url the requests go straight to the ASGI app with
+the login rate limits lifted. Prints req/s and latency percentiles per
+route as JSON so runs can be diffed.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import bench_engine, percentile, prepare_schema
+from madr.app import app
+from madr.config.security import get_password_hash
+from madr.data.models import Account, Book, Novelist
+from madr.utils import ratelimit
+
+PREFIX = 'load'
+EMAIL = 'load@bench.com'
+PASSWORD = 'load-password'
+DEFAULT_MIX = 'login=1,list=6,search=3,get=8,write=2'
+WORDS = ('amor', 'mar', 'noite', 'casa', 'sertao', 'cidade', 'rio', 'sol')
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in OPERATIONS:
+            raise SystemExit(f'unknown operation in --mix: {name}')
+        weights[name] = int(weight or 1)
+    return weights
+
+
+async def seed(session: AsyncSession, novelists: int, books: int):
+    if not await session.scalar(
+        select(Account.id).where(Account.email == EMAIL)
+    ):
+        session.add(
+            Account(
+                username=PREFIX,
+                email=EMAIL,
+                password=get_password_hash(PASSWORD),
+            )
+        )
+
+    existing = await session.scalar(
+        select(func.count()).where(Novelist.name.like(f'{PREFIX} %'))
+    )
+    if existing < novelists:
+        await session.execute(
+            insert(Novelist),
+            [
+                {'name': f'{PREFIX} novelist {i}'}
+                for i in range(existing, novelists)
+            ],
+        )
+
+    author_ids = (
+        await session.scalars(
+            select(Novelist.id).where(Novelist.name.like(f'{PREFIX} %'))
+        )
+    ).all()
+    existing = await session.scalar(
+        select(func.count()).where(Book.title.like(f'{PREFIX} %'))
+    )
+    rng = random.Random(existing)
+    for start in range(existing, books, 5_000):
+        await session.execute(
+            insert(Book),
+            [
+                {
+                    'title': f'{PREFIX} {rng.choice(WORDS)} {i}',
+                    'year': str(rng.randint(1850, 2024)),
+                    'author_id': rng.choice(author_ids),
+                }
+                for i in range(start, min(start + 5_000, books))
+            ],
+        )
+
+    await session.commit()
+
+    return (
+        await session.scalars(
+            select(Book.id).where(Book.title.like(f'{PREFIX} %')).limit(10_000)
+        )
+    ).all()
+
+
+async def login(client: AsyncClient, state: dict, rng: random.Random):
+    response = await client.post(
+        '/auth/token', data={'username': EMAIL, 'password': PASSWORD}
+    )
+    if response.is_success:
+        token = response.json()['access_token']
+        state['headers'] = {'Authorization': f'Bearer {token}'}
+    return response
+
+
+async def list_books(client: AsyncClient, state: dict, rng: random.Random):
+    offset = rng.choice((0, 0, 0, 20, 40))
+    return await client.get(
+        f'/books/?limit=20&offset={offset}', headers=state['headers']
+    )
+
+
+async def search_books(client: AsyncClient, state: dict, rng: random.Random):
+    return await client.get(
+        f'/books/?title={rng.choice(WORDS)}', headers=state['headers']
+    )
+
+
+async def get_book(client: AsyncClient, state: dict, rng: random.Random):
+    book_id = rng.choice(state['book_ids'])
+    return await client.get(f'/books/{book_id}', headers=state['headers'])
+
+
+async def write_book(client: AsyncClient, state: dict, rng: random.Random):
+    book_id = rng.choice(state['book_ids'])
+    return await client.patch(
+        f'/books/{book_id}',
+        json={'year': str(rng.randint(1850, 2024))},
+        headers=state['headers'],
+    )
+
+
+OPERATIONS = {
+    'login': login,
+    'list': list_books,
+    'search': search_books,
+    'get': get_book,
+    'write': write_book,
+}
+
+
+async def run_client(  # noqa: PLR0913, PLR0917
+    client: AsyncClient,
+    weights: dict[str, int],
+    book_ids: list[int],
+    deadline: float,
+    samples: defaultdict,
+    seed_value: int,
+):
+    rng = random.Random(seed_value)
+    state = {'book_ids': book_ids, 'headers': {}}
+    await login(client, state, rng)
+
+    names, counts = list(weights), list(weights.values())
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, counts)[0]
+        start = time.perf_counter()
+        try:
+            response = await OPERATIONS[name](client, state, rng)
+            ok = response.is_success
+        except Exception:  # noqa: BLE001
+            ok = False
+        samples[name].append(((time.perf_counter() - start) * 1000, ok))
+
+
+def summary(samples: list, elapsed: float) -> dict:
+    latencies = [latency for latency, _ in samples]
+    return {
+        'requests': len(samples),
+        'errors': sum(not ok for _, ok in samples),
+        'rps': round(len(samples) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+    }
+
+
+def build_client(url: str | None) -> AsyncClient:
+    if url:
+        return AsyncClient(base_url=url, timeout=30)
+
+    # Every client logs in from the same address and account
+    ratelimit.LOGIN_BY_IP = ratelimit.LOGIN_BY_IP._replace(per_minute=0)
+    ratelimit.LOGIN_BY_USERNAME = ratelimit.LOGIN_BY_USERNAME._replace(
+        per_minute=0
+    )
+    return AsyncClient(
+        transport=ASGITransport(app=app), base_url='http://bench', timeout=30
+    )
+
+
+async def main(args: argparse.Namespace):
+    weights = parse_mix(args.mix)
+
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+    async with AsyncSession(engine) as session:
+        if args.no_seed:
+            book_ids = (
+                await session.scalars(select(Book.id).limit(10_000))
+            ).all()
+        else:
+            book_ids = await seed(session, args.novelists, args.books)
+    await engine.dispose()
+
+    samples = defaultdict(list)
+    async with build_client(args.url) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        await asyncio.gather(
+            *(
+                run_client(
+                    client, weights, book_ids, deadline, samples, args.seed + i
+                )
+                for i in range(args.clients)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    everything = [sample for route in samples.values() for sample in route]
+    print(
+        json.dumps(
+            {
+                'target': args.url or 'asgi',
+                'clients': args.clients,
+                'duration_s': round(elapsed, 3),
+                'mix': weights,
+                'total': summary(everything, elapsed),
+                'routes': {
+                    name: summary(route, elapsed)
+                    for name, route in sorted(samples.items())
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', help='running server; defaults to the app')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30)
+    parser.add_argument('--mix', default=DEFAULT_MIX)
+    parser.add_argument('--novelists', type=int, default=100)
+    parser.add_argument('--books', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-seed', action='store_true')
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,118 @@
+"""Latency of a read route while a burst of logins hashes passwords.
+
+Usage: python -m benchmarks.login_burst --logins 8 --probes 300
+
+Pass --blocking to verify passwords inline on the event loop, which is how
+login_for_access_token behaved before the hashing pool.
+"""
+
+import argparse
+import asyncio
+import json
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import bench_engine, percentile, prepare_schema
+from madr.app import app
+from madr.config.security import get_password_hash, verify_password
+from madr.data.models import Account
+from madr.routers import auth
+
+EMAIL = 'login-burst@bench.com'
+PASSWORD = 'login-burst-password'
+
+
+async def verify_password_inline(plain_password: str, hashed_password: str):
+    return verify_password(plain_password, hashed_password)
+
+
+async def probe(client: AsyncClient, count: int, interval: float) -> list:
+    # Open-loop arrivals: latency is measured from the scheduled arrival, so
+    # time spent waiting for a blocked event loop is included.
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def arrival(index: int) -> float:
+        scheduled = start + index * interval
+        await asyncio.sleep(max(0, scheduled - loop.time()))
+        await client.get('/')
+        return (loop.time() - scheduled) * 1000
+
+    return await asyncio.gather(*(arrival(i) for i in range(count)))
+
+
+async def login_loop(client: AsyncClient, stop: asyncio.Event) -> int:
+    logins = 0
+    while not stop.is_set():
+        await client.post(
+            '/auth/token', data={'username': EMAIL, 'password': PASSWORD}
+        )
+        logins += 1
+    return logins
+
+
+def summary(latencies: list[float]) -> dict:
+    return {
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(max(latencies), 3),
+    }
+
+
+async def main(logins: int, probes: int, interval: float, blocking: bool):
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+    async with AsyncSession(engine) as session:
+        await session.execute(delete(Account).where(Account.email == EMAIL))
+        session.add(
+            Account(
+                username='login-burst',
+                email=EMAIL,
+                password=get_password_hash(PASSWORD),
+            )
+        )
+        await session.commit()
+
+    if blocking:
+        auth.verify_password_async = verify_password_inline
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        idle = await probe(c, probes, interval)
+
+        stop = asyncio.Event()
+        workers = [
+            asyncio.create_task(login_loop(c, stop)) for _ in range(logins)
+        ]
+        loaded = await probe(c, probes, interval)
+        stop.set()
+        completed = sum(await asyncio.gather(*workers))
+
+    await engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                'mode': 'blocking' if blocking else 'executor',
+                'concurrent_logins': logins,
+                'logins_completed': completed,
+                'idle': summary(idle),
+                'during_logins': summary(loaded),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=8)
+    parser.add_argument('--probes', type=int, default=300)
+    parser.add_argument('--interval', type=float, default=0.01)
+    parser.add_argument('--blocking', action='store_true')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins, args.probes, args.interval, args.blocking))
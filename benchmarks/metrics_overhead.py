@@ -0,0 +1,87 @@
+"""Per-request cost of MetricsMiddleware.
+
+Usage: python -m benchmarks.metrics_overhead --requests 100000
+
+Times a trivial ASGI app with and without the middleware, so the difference
+is the middleware alone, and puts it next to a full request to the '/'
+health check through the real application.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from madr.app import app
+from madr.utils.metrics import Metrics, MetricsMiddleware
+
+
+class Route:
+    path = '/books/{book_id}'
+
+
+async def endpoint(scope, receive, send):
+    scope['route'] = Route
+    await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b'{"server":"up"}'})
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b''}
+
+
+async def send(message):
+    pass
+
+
+async def per_call_us(asgi_app, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {'type': 'http', 'method': 'GET', 'path': '/books/1'}
+        await asgi_app(scope, receive, send)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def full_request_us(requests: int) -> float:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        start = time.perf_counter()
+        for _ in range(requests):
+            await c.get('/')
+        return (time.perf_counter() - start) / requests * 1_000_000
+
+
+async def main(requests: int):
+    instrumented = MetricsMiddleware(endpoint, metrics=Metrics())
+
+    await per_call_us(instrumented, requests // 10)
+    bare = await per_call_us(endpoint, requests)
+    measured = await per_call_us(instrumented, requests)
+    full = await full_request_us(max(requests // 20, 1))
+
+    overhead = measured - bare
+    print(
+        json.dumps(
+            {
+                'requests': requests,
+                'bare_asgi_us': round(bare, 3),
+                'with_middleware_us': round(measured, 3),
+                'overhead_us': round(overhead, 3),
+                'health_check_request_us': round(full, 3),
+                'overhead_pct_of_health_check': round(
+                    overhead / full * 100, 2
+                ),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests))
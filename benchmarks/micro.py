@@ -0,0 +1,128 @@
+"""Microbenchmarks for the helpers and schemas on every request's hot path.
+
+Usage: python -m benchmarks.micro --save     # record benchmarks/baseline.json
+       python -m benchmarks.micro --check    # exit 1 on a regression
+
+Each case is timed in short rounds interleaved with a fixed pure-Python
+calibration loop, and the median case/calibration ratio is its relative
+cost. A baseline recorded on one machine thus stays comparable on a faster
+or slower one. --check fails when a case's relative cost grows by more than
+--tolerance percent. The pipeline runs the check as `task bench` after the
+tests.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+from statistics import median
+
+from jwt import decode
+
+from madr.config.security import create_access_token, settings
+from madr.schemas.account import AccountSchema
+from madr.schemas.book import BookSchema, BookUpdate
+from madr.utils.sanitize import sanitize_data
+
+BASELINE = Path(__file__).with_name('baseline.json')
+TOKEN = create_access_token({'sub': 'machado@madr.com'})
+BOOK = {'year': '1899', 'title': 'Dom Casmurro', 'author_id': 1}
+ACCOUNT = {
+    'username': 'machado',
+    'email': 'machado@madr.com',
+    'password': 'capitu',
+}
+
+
+def calibration():
+    total = 0
+    for value in range(200):
+        total += value * value
+    return total
+
+
+CASES = {
+    'sanitize_data': lambda: sanitize_data('  Dom   Casmurro: Capítulo 1!  '),
+    'create_access_token': lambda: create_access_token({'sub': 'a@b.com'}),
+    'jwt_decode': lambda: decode(
+        TOKEN, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    ),
+    'BookSchema': lambda: BookSchema.model_validate(BOOK),
+    'BookUpdate': lambda: BookUpdate.model_validate({'year': '1900'}),
+    'AccountSchema': lambda: AccountSchema.model_validate(ACCOUNT),
+}
+
+
+def loops_for(timer: timeit.Timer) -> int:
+    # About 20 ms per round, so many rounds fit in a quiet stretch
+    loops, _ = timer.autorange()
+    return max(loops // 10, 1)
+
+
+def measure(function, rounds: int) -> tuple[float, float]:
+    case, reference = timeit.Timer(function), timeit.Timer(calibration)
+    case_loops, reference_loops = loops_for(case), loops_for(reference)
+
+    # Interleaving makes each ratio compare timings taken side by side
+    times, ratios = [], []
+    for _ in range(rounds):
+        base = reference.timeit(reference_loops) / reference_loops
+        elapsed = case.timeit(case_loops) / case_loops
+        times.append(elapsed * 1e9)
+        ratios.append(elapsed / base)
+
+    return median(times), median(ratios)
+
+
+def run(rounds: int) -> dict:
+    results = {}
+    for name, function in CASES.items():
+        elapsed, relative = measure(function, rounds)
+        results[name] = {
+            'ns': round(elapsed, 1),
+            'relative': round(relative, 4),
+        }
+    return results
+
+
+def check(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['relative']
+        change = (result['relative'] - before) / before * 100
+        result['change_pct'] = round(change, 1)
+        if change > tolerance:
+            regressions.append(f'{name}: +{change:.1f}% (> {tolerance}%)')
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    results = run(args.rounds)
+
+    if args.save:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+
+    regressions = []
+    if args.check:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = check(results, baseline, args.tolerance)
+
+    print(json.dumps(results, indent=2))
+    for regression in regressions:
+        print(f'REGRESSION {regression}', file=sys.stderr)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--check', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=25.0)
+    parser.add_argument('--rounds', type=int, default=40)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,78 @@
+"""Per-request CPU time of list pages with and without FAST_JSON.
+
+Usage: python -m benchmarks.serialization --rows 10000 --limit 100
+
+Both modes run against the same seeded catalog with the response cache
+disabled, so every request pays for the query and the serialization.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.common import (
+    bench_engine,
+    percentile,
+    prepare_schema,
+    seed_books,
+)
+from madr.app import app
+from madr.config.security import get_current_user
+from madr.data.models import Account
+from madr.utils import serialization
+from madr.utils.response_cache import response_cache
+
+
+async def measure(client: AsyncClient, url: str, requests: int) -> dict:
+    cpu = []
+    for _ in range(requests):
+        start = time.process_time()
+        response = await client.get(url)
+        cpu.append((time.process_time() - start) * 1000)
+        response.raise_for_status()
+
+    return {
+        'cpu_mean_ms': round(sum(cpu) / len(cpu), 3),
+        'cpu_p50_ms': round(percentile(cpu, 50), 3),
+        'cpu_p99_ms': round(percentile(cpu, 99), 3),
+        'bytes': len(response.content),
+    }
+
+
+async def main(rows: int, limit: int, requests: int):
+    engine = bench_engine()
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+        await seed_books(conn, rows)
+    await engine.dispose()
+
+    response_cache.entries.maxsize = 0
+    app.dependency_overrides[get_current_user] = lambda: Account(
+        username='bench', password='', email='bench@bench.com'
+    )
+
+    url = f'/books/?limit={limit}'
+    results = {}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url='http://bench') as c:
+        for fast_json in (False, True):
+            serialization.settings.FAST_JSON = fast_json
+            await measure(c, url, max(requests // 10, 1))
+            mode = 'fast_json' if fast_json else 'validated'
+            results[mode] = await measure(c, url, requests)
+
+    summary = {'rows': rows, 'page_size': limit, 'requests': requests}
+    print(json.dumps({**summary, **results}, indent=2))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.limit, args.requests))
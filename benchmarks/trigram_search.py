@@ -0,0 +1,74 @@
+"""EXPLAIN the title filter of list_books with and without the trigram index.
+
+Usage: python -m benchmarks.trigram_search --rows 300000 --term c0ffee
+
+Runs against Settings().DATABASE_URL; use a scratch database.
+"""
+
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from benchmarks.common import bench_engine, prepare_schema, seed_books
+from madr.data.models import Book
+from madr.data.search import contains
+
+
+def plan_nodes(plan: dict) -> list[str]:
+    nodes = [plan['Node Type']]
+    for child in plan.get('Plans', []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+async def explain(conn, sql: str) -> dict:
+    result = await conn.scalar(text(f'EXPLAIN (ANALYZE, FORMAT JSON) {sql}'))
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+async def main(rows: int, term: str):
+    engine = bench_engine()
+    query = select(Book).where(contains(Book.title, term)).limit(10)
+    sql = str(
+        query.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={'literal_binds': True},
+        )
+    )
+
+    async with engine.begin() as conn:
+        await prepare_schema(conn)
+        await seed_books(conn, rows)
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        await conn.execute(text('DROP INDEX ix_books_title_trgm'))
+        without_index = await explain(conn, sql)
+        await trans.rollback()
+
+        with_index = await explain(conn, sql)
+
+    await engine.dispose()
+
+    for label, result in (
+        ('without trigram index', without_index),
+        ('with trigram index', with_index),
+    ):
+        print(
+            f'{label:>22}: {" -> ".join(plan_nodes(result["Plan"]))} '
+            f'({result["Execution Time"]:.2f} ms)'
+        )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=300_000)
+    parser.add_argument('--term', default='c0ffee')
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rows, args.term))
@@ -1,15 +1,45 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 
-from madr.routers import account, auth, book, novelist
+from madr.config.security import require_internal_token
+from madr.config.settings import Settings
+from madr.data.database import track_writes
+from madr.data.instrumentation import QueryStatsMiddleware
+from madr.routers import account, auth, book, internal, novelist, search
+from madr.utils.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
 
-app = FastAPI(title='MADR', summary='Meu Acervo Digital de Romances')
+settings = Settings()
+
+app = FastAPI(
+    title='MADR',
+    summary='Meu Acervo Digital de Romances',
+    dependencies=[Depends(track_writes)],
+)
+
+if settings.QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 app.include_router(account.router)
 app.include_router(auth.router)
 app.include_router(book.router)
+app.include_router(internal.router)
 app.include_router(novelist.router)
+app.include_router(search.router)
 
 
 @app.get('/', tags=['heath_check'])
 async def read_root():
     return {'server': 'up'}
+
+
+@app.get(
+    '/metrics',
+    tags=['internal'],
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_internal_token)],
+)
+async def read_metrics():
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,24 +1,35 @@
+from asyncio import get_running_loop
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from hmac import compare_digest
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jwt import ExpiredSignatureError, PyJWTError, decode, encode
 from pwdlib import PasswordHash
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from zoneinfo import ZoneInfo
 
 from madr.config.settings import Settings
-from madr.data.database import get_async_session
+from madr.data.database import get_async_session, record_subject
 from madr.data.models import Account
 from madr.schemas.auth import TokenData
+from madr.utils.cache import TTLCache
 
 settings = Settings()
 pwd_context = PasswordHash.recommended()
+hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix='argon2'
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/token')
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
 T_Session = Annotated[AsyncSession, Depends(get_async_session)]
 
 
@@ -30,6 +41,18 @@ def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def get_password_hash_async(password: str):
+    return await get_running_loop().run_in_executor(
+        hash_executor, get_password_hash, password
+    )
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await get_running_loop().run_in_executor(
+        hash_executor, verify_password, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict):
     to_encode = data.copy()
 
@@ -45,6 +68,32 @@ def create_access_token(data: dict):
     return encoded_jwt
 
 
+def cache_user(user: Account):
+    user_cache.set(
+        user.email,
+        {
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(Account).column_attrs
+        },
+    )
+
+
+async def get_cached_user(session: AsyncSession, subject: str):
+    identity = user_cache.get(subject)
+    if identity is None:
+        return None
+
+    # Rebuilt from the same columns cache_user stored, without __init__
+    mapper = inspect(Account)
+    user = mapper.class_manager.new_instance()
+    for attr in mapper.column_attrs:
+        setattr(user, attr.key, identity[attr.key])
+    make_transient_to_detached(user)
+
+    # load=False attaches the cached identity without emitting a SELECT
+    return await session.merge(user, load=False)
+
+
 async def get_current_user(
     session: T_Session, token: str = Depends(oauth2_scheme)
 ):
@@ -68,6 +117,11 @@ async def get_current_user(
     except PyJWTError:
         raise credentials_exception
 
+    user = await get_cached_user(session, token_data.username)
+    if user is not None:
+        record_subject(token_data.username)
+        return user
+
     user = await session.scalar(
         select(Account).where(Account.email == token_data.username)
     )
@@ -75,4 +129,22 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
 
+    cache_user(user)
+    record_subject(token_data.username)
+
     return user
+
+
+def require_internal_token(
+    token: Annotated[str | None, Header(alias='X-Internal-Token')] = None,
+):
+    # Without INTERNAL_TOKEN the internal endpoints do not exist
+    if not settings.INTERNAL_TOKEN:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND)
+
+    if token is None or not compare_digest(
+        token.encode(), settings.INTERNAL_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not authorized'
+        )
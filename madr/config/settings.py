@@ -6,6 +6,37 @@ class Settings(BaseSettings):
         env_file='.env', env_file_encoding='utf-8', extra='ignore'
     )
     DATABASE_URL: str
+    READ_DATABASE_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: float = 5
+    READ_YOUR_WRITES_MAX_USERS: int = 10_000
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: float = 60
+    PASSWORD_HASH_WORKERS: int = 4
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_PGBOUNCER: bool = False
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 30
+    COUNT_CACHE_MAX_SIZE: int = 1024
+    COUNT_CACHE_TTL_SECONDS: float = 10
+    FAST_JSON: bool = False
+    LOGIN_IP_PER_MINUTE: float = 60
+    LOGIN_IP_BURST: int = 20
+    LOGIN_USERNAME_PER_MINUTE: float = 10
+    LOGIN_USERNAME_BURST: int = 5
+    RATE_LIMIT_MAX_KEYS: int = 100_000
+    TRUSTED_PROXIES: list[str] = []
+    METRICS_ENABLED: bool = True
+    INTERNAL_TOKEN: str | None = None
+    QUERY_STATS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
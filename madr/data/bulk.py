@@ -0,0 +1,294 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+from typing import AsyncIterator, Callable, Literal
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from madr.config.settings import Settings
+from madr.data.models import Book, Novelist
+from madr.schemas.book import BookSchema
+from madr.schemas.bulk import ImportReport
+from madr.schemas.novelist import NovelistSchema
+from madr.utils.sanitize import normalize_key, sanitize_data
+
+settings = Settings()
+
+NDJSON_TYPES = {
+    'application/x-ndjson',
+    'application/jsonl',
+    'application/json',
+}
+CSV_TYPES = {'text/csv', 'application/csv'}
+MAX_LINE_BYTES = 64 * 1024
+EXPORT_MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[bytes | None]:
+    # Lines over MAX_LINE_BYTES are dropped as they stream in and come out
+    # as None, so the rest of the import still runs and gets reported
+    buffer = b''
+    skipping = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b'\n')
+
+        for line in lines:
+            yield None if skipping or len(line) > MAX_LINE_BYTES else line
+            skipping = False
+
+        if len(buffer) > MAX_LINE_BYTES:
+            skipping = True
+            buffer = b''
+
+    if skipping:
+        yield None
+    elif buffer:
+        yield buffer
+
+
+async def iter_records(request: Request) -> AsyncIterator[tuple]:
+    content_type = request.headers.get('content-type', '').split(';')[0]
+    content_type = content_type.strip().lower()
+
+    if content_type not in NDJSON_TYPES | CSV_TYPES:
+        raise HTTPException(
+            status_code=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            detail='Send NDJSON or CSV rows',
+        )
+
+    header = None
+    line_number = 0
+    async for raw in iter_lines(request.stream()):
+        line_number += 1
+
+        if raw is None:
+            yield line_number, None, f'Line over {MAX_LINE_BYTES} bytes'
+            continue
+
+        try:
+            # utf-8-sig drops the byte order mark spreadsheets put first
+            encoding = 'utf-8-sig' if line_number == 1 else 'utf-8'
+            line = raw.decode(encoding).strip()
+            if not line:
+                continue
+
+            if content_type in CSV_TYPES:
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [name.strip() for name in values]
+                    continue
+                record = dict(zip(header, values))
+            else:
+                record = json.loads(line)
+
+        except (UnicodeDecodeError, ValueError, csv.Error) as error:
+            yield line_number, None, f'Malformed row: {error}'
+            continue
+
+        yield line_number, record, None
+
+
+def validation_detail(error: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, item["loc"])) or "row"}: {item["msg"]}'
+        for item in error.errors()
+    )
+
+
+class ImportRun:
+    def __init__(self, conflict: str):
+        self.conflict = conflict
+        self.inserted = 0
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line: int, detail: str):
+        self.rejected += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append({'line': line, 'detail': detail})
+
+    def report(self) -> ImportReport:
+        return ImportReport(
+            inserted=self.inserted, rejected=self.rejected, errors=self.errors
+        )
+
+
+async def run_import(
+    session: AsyncSession,
+    records: AsyncIterator[tuple],
+    schema: type[BaseModel],
+    load_batch: Callable,
+    conflict: str,
+) -> ImportReport:
+    run = ImportRun(conflict)
+    batch = []
+
+    async for line, record, error in records:
+        if error:
+            run.reject(line, error)
+            continue
+
+        try:
+            batch.append((line, schema.model_validate(record)))
+        except ValidationError as validation_error:
+            run.reject(line, validation_detail(validation_error))
+            continue
+
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await load_batch(session, batch, run)
+            batch = []
+
+    if batch:
+        await load_batch(session, batch, run)
+
+    return run.report()
+
+
+def unique_rows(batch: list, key: str, run: ImportRun) -> dict:
+    rows = {}
+    for line, row in batch:
+        if row[key] in rows:
+            run.reject(line, run.conflict)
+        else:
+            rows[row[key]] = (line, row)
+    return rows
+
+
+async def insert_rows(
+    session: AsyncSession, model, key: str, rows: dict, run: ImportRun
+):
+    if not rows:
+        return
+
+    inserted = set(
+        await session.scalars(
+            insert(model)
+            .values([row for _, row in rows.values()])
+            .on_conflict_do_nothing(index_elements=[key])
+            .returning(getattr(model, key))
+        )
+    )
+    await session.commit()
+
+    run.inserted += len(inserted)
+    for value, (line, _) in rows.items():
+        if value not in inserted:
+            run.reject(line, run.conflict)
+
+
+async def load_novelists(session: AsyncSession, batch: list, run: ImportRun):
+    names = [(line, sanitize_data(novelist.name)) for line, novelist in batch]
+    rows = unique_rows(
+        [
+            (line, {'name': name, 'name_key': normalize_key(name)})
+            for line, name in names
+        ],
+        'name_key',
+        run,
+    )
+    await insert_rows(session, Novelist, 'name_key', rows, run)
+
+
+async def load_books(session: AsyncSession, batch: list, run: ImportRun):
+    author_ids = {book.author_id for _, book in batch}
+    known_authors = set(
+        await session.scalars(
+            select(Novelist.id).where(Novelist.id.in_(author_ids))
+        )
+    )
+
+    candidates = []
+    for line, book in batch:
+        # BookSchema lets out-of-range years through as None
+        if book.year is None:
+            run.reject(line, 'year: Value error, Invalid year format')
+            continue
+
+        if book.author_id not in known_authors:
+            run.reject(line, 'Novelist not listed in MADR')
+            continue
+
+        title = sanitize_data(book.title)
+        candidates.append((
+            line,
+            {
+                'title': title,
+                'title_key': normalize_key(title),
+                'year': book.year,
+                'author_id': book.author_id,
+            },
+        ))
+
+    rows = unique_rows(candidates, 'title_key', run)
+    await insert_rows(session, Book, 'title_key', rows, run)
+
+
+async def import_novelists(session: AsyncSession, request: Request):
+    return await run_import(
+        session,
+        iter_records(request),
+        NovelistSchema,
+        load_novelists,
+        'novelist already on the MADR',
+    )
+
+
+async def import_books(session: AsyncSession, request: Request):
+    return await run_import(
+        session,
+        iter_records(request),
+        BookSchema,
+        load_books,
+        'book already on the MADR',
+    )
+
+
+def export_query(include_author: bool):
+    columns = [Book.id, Book.title, Book.year, Book.author_id]
+    if include_author:
+        columns.append(Novelist.name.label('author'))
+
+    query = select(*columns).order_by(Book.id)
+    if include_author:
+        query = query.join(Novelist, Novelist.id == Book.author_id)
+
+    return query.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+
+
+def encode_rows(rows: list, fields: list, fmt: str) -> bytes:
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        return buffer.getvalue().encode()
+
+    return ''.join(
+        json.dumps(dict(zip(fields, row)), ensure_ascii=False) + '\n'
+        for row in rows
+    ).encode()
+
+
+async def export_books(
+    session: AsyncSession,
+    fmt: Literal['ndjson', 'csv'],
+    include_author: bool,
+) -> AsyncIterator[bytes]:
+    query = export_query(include_author)
+    fields = [column.name for column in query.selected_columns]
+
+    if fmt == 'csv':
+        yield encode_rows([fields], fields, fmt)
+
+    # The request session is closed before the body is streamed, so the
+    # export holds its own connection with a server-side cursor.
+    async with session.bind.connect() as conn:
+        result = await conn.stream(query)
+        async for rows in result.partitions():
+            yield encode_rows(rows, fields, fmt)
@@ -0,0 +1,49 @@
+from typing import Hashable, Literal
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from madr.config.settings import Settings
+from madr.utils.cache import TTLCache
+
+settings = Settings()
+
+CountMode = Literal['exact', 'estimated', 'none']
+
+count_cache = TTLCache(
+    maxsize=settings.COUNT_CACHE_MAX_SIZE, ttl=settings.COUNT_CACHE_TTL_SECONDS
+)
+
+
+async def exact_count(
+    session: AsyncSession, query: Select, key: Hashable
+) -> int:
+    # Every page of a listing shares one count until the TTL runs out
+    total = count_cache.get(key)
+    if total is None:
+        total = await session.scalar(
+            select(func.count()).select_from(query.subquery())
+        )
+        count_cache.set(key, total)
+    return total
+
+
+async def estimated_count(session: AsyncSession, query: Select) -> int:
+    # The planner scales pg_class.reltuples by the filters' selectivity
+    # without reading a single row
+    connection = await session.connection()
+    compiled = query.compile(dialect=connection.dialect)
+    plan = await connection.exec_driver_sql(
+        f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+    )
+    return plan.scalar()[0]['Plan']['Plan Rows']
+
+
+async def count_rows(
+    session: AsyncSession, query: Select, mode: CountMode, key: Hashable
+) -> int | None:
+    if mode == 'exact':
+        return await exact_count(session, query, key)
+    if mode == 'estimated':
+        return await estimated_count(session, query)
+    return None
@@ -1,13 +1,150 @@
+from contextvars import ContextVar
+from time import perf_counter
 from typing import AsyncGenerator
 
+from fastapi import Request
+from jwt import PyJWTError, decode
+from sqlalchemy import event, exc
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from madr.config.settings import Settings
+from madr.data.instrumentation import instrument
+from madr.utils.cache import TTLCache
 
-engine = create_async_engine(Settings().DATABASE_URL)
+settings = Settings()
+recent_writers = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+
+class RequestWrites:
+    def __init__(self):
+        self.committed = False
+        self.subject = None
+
+
+request_writes: ContextVar[RequestWrites | None] = ContextVar(
+    'request_writes', default=None
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_time = 0.0
+
+    def _do_get(self):
+        start = perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.checkouts += 1
+            self.wait_time += perf_counter() - start
+
+    def stats(self) -> dict:
+        return {
+            'size': self.size(),
+            'max_overflow': self._max_overflow,
+            'checked_out': self.checkedout(),
+            'idle': self.checkedin(),
+            'overflow': max(self.overflow(), 0),
+            'checkouts': self.checkouts,
+            'checkout_timeouts': self.checkout_timeouts,
+            'wait_time_seconds': self.wait_time,
+        }
+
+
+def build_engine(url: str):
+    # PgBouncer in transaction mode cannot keep server-side prepared
+    # statements, so psycopg must never promote queries to PREPARE.
+    connect_args = {'prepare_threshold': None} if settings.DB_PGBOUNCER else {}
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    instrument(engine)
+
+    return engine
+
+
+engine = build_engine(settings.DATABASE_URL)
+read_engine = (
+    build_engine(settings.READ_DATABASE_URL)
+    if settings.READ_DATABASE_URL
+    else engine
+)
+
+
+def request_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get('authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not token:
+        return None
+
+    # Only a routing hint: the signature is checked by get_current_user
+    try:
+        return decode(token, options={'verify_signature': False}).get('sub')
+    except PyJWTError:
+        return None
+
+
+def reads_own_writes(request: Request) -> bool:
+    subject = request_subject(request)
+    return subject is not None and subject in recent_writers
+
+
+@event.listens_for(Session, 'after_commit')
+def record_commit(session: Session):
+    writes = request_writes.get()
+    if writes is not None:
+        writes.committed = True
+
+
+def record_subject(subject: str):
+    # Called once get_current_user has verified the token
+    writes = request_writes.get()
+    if writes is not None:
+        writes.subject = subject
+
+
+async def track_writes(request: Request) -> AsyncGenerator:
+    # Only handlers that write commit, so read-only POSTs such as
+    # /books/batch keep reading from the replica. Anonymous writes never
+    # open a window, whatever Authorization header they carry
+    writes = RequestWrites()
+    request_writes.set(writes)
+    yield
+
+    # Only reached when the handler succeeded
+    if writes.committed and writes.subject is not None:
+        recent_writers.set(writes.subject, True)
 
 
 async def get_async_session() -> AsyncGenerator:  # pragma: no cover
-    async with AsyncSession(engine) as session:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_async_read_session(request: Request) -> AsyncGenerator:
+    fresh = read_engine is not engine and reads_own_writes(request)
+    request.state.fresh_reads = fresh
+
+    async with AsyncSession(
+        engine if fresh else read_engine, expire_on_commit=False
+    ) as session:
         yield session
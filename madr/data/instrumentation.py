@@ -0,0 +1,132 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from madr.config.settings import Settings
+
+settings = Settings()
+logger = logging.getLogger(__name__)
+
+PARAMETERS = re.compile(r'%\(\w+\)s(?:::\w+)?(?:, %\(\w+\)s(?:::\w+)?)*')
+
+
+def statement_shape(statement: str) -> str:
+    # Expanded IN lists differ only by their parameter count
+    return PARAMETERS.sub('?', ' '.join(statement.split()))
+
+
+class QueryStats:
+    def __init__(self, parent: 'QueryStats | None' = None):
+        self.parent = parent
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: str | None = None
+        self.statements: list[str] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total_time += elapsed
+            stats.statements.append(statement)
+            if elapsed > stats.slowest_time:
+                stats.slowest_time = elapsed
+                stats.slowest_statement = statement
+            stats = stats.parent
+
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.shapes[shape] == settings.N_PLUS_ONE_THRESHOLD:
+            logger.warning(
+                'Possible N+1: statement repeated %d times in one request: %s',
+                settings.N_PLUS_ONE_THRESHOLD,
+                shape,
+            )
+
+
+current_stats: ContextVar[QueryStats | None] = ContextVar(
+    'query_stats', default=None
+)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats(parent=current_stats.get())
+    token = current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_stats.reset(token)
+
+
+def before_cursor_execute(conn, cursor, statement, *args):
+    # Executions on a connection never nest, and after_cursor_execute is
+    # skipped when one fails, so a single slot is overwritten, not leaked
+    conn.info['query_start'] = perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, *args):
+    elapsed = perf_counter() - conn.info.pop('query_start')
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning('Slow query (%.1f ms): %s', elapsed * 1000, statement)
+
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def instrument(engine: AsyncEngine):
+    sync_engine = engine.sync_engine
+    if event.contains(
+        sync_engine, 'after_cursor_execute', after_cursor_execute
+    ):
+        return
+
+    event.listen(sync_engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message):
+                if message['type'] == 'http.response.start':
+                    timing = (
+                        f'db;dur={stats.total_time * 1000:.3f};'
+                        f'desc="{stats.count} queries"'
+                    )
+                    message['headers'] = [
+                        *message.get('headers', []),
+                        (b'server-timing', timing.encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        logger.debug(
+            '%s %s: %d queries, %.1f ms in the database, slowest %.1f ms: %s',
+            scope['method'],
+            scope['path'],
+            stats.count,
+            stats.total_time * 1000,
+            stats.slowest_time * 1000,
+            stats.slowest_statement,
+        )
@@ -1,10 +1,76 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import (
+    DDL,
+    Computed,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, registry, relationship
+from sqlalchemy.types import TypeDecorator
+
+from madr.utils.sanitize import normalize_key
 
 table_registry = registry()
 
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'),
+)
+
+SEARCH_CONFIG = 'madr_portuguese'
+
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS unaccent'),
+)
+# Portuguese stemming over accent-folded words, so "coracao" finds "Coração"
+event.listen(
+    table_registry.metadata,
+    'before_create',
+    DDL(
+        'DO $$ BEGIN '
+        'IF NOT EXISTS (SELECT FROM pg_ts_config '
+        f"WHERE cfgname = '{SEARCH_CONFIG}') THEN "
+        f'CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} '
+        '(COPY = portuguese); '
+        f'ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} '
+        'ALTER MAPPING FOR hword, hword_part, word '
+        'WITH unaccent, portuguese_stem; '
+        'END IF; END $$'
+    ),
+)
+
+
+def search_vector(column: str):
+    return mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}', {column})", persisted=True),
+        init=False,
+        deferred=True,
+    )
+
+
+def normalized_key(column: str):
+    # Inserts that do not pass the key derive it from the source column
+    def default(context):
+        return normalize_key(context.get_current_parameters()[column])
+
+    # Byte order lets the unique index also serve prefix ranges and sorting
+    return mapped_column(
+        String(collation='C'),
+        init=False,
+        unique=True,
+        insert_default=default,
+    )
+
 
 @table_registry.mapped_as_dataclass
 class Account:
@@ -18,34 +84,95 @@ class Account:
         init=False,
         server_default=func.now(),
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
 
 @table_registry.mapped_as_dataclass
 class Novelist:
     __tablename__ = 'novelists'
+    __table_args__ = (
+        Index(
+            'ix_novelists_name_trgm',
+            'name',
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+        ),
+        Index('ix_novelists_search', 'search', postgresql_using='gin'),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     name: Mapped[str] = mapped_column(unique=True)
+    name_key: Mapped[str] = normalized_key('name')
+    search: Mapped[str] = search_vector('name')
 
     books: Mapped[list['Book']] = relationship(
-        init=False, back_populates='author', cascade='all, delete-orphan'
+        init=False,
+        back_populates='author',
+        cascade='all, delete-orphan',
+        passive_deletes=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class Year(TypeDecorator):
+    # Stored as an integer so ranges and sorting use the index, but the API
+    # keeps exchanging years as strings
+    impl = Integer
+    cache_ok = True
+
+    @property
+    def python_type(self):
+        return str
+
+    def process_bind_param(self, value, dialect):  # noqa: PLR6301
+        return None if value is None else int(value)
+
+    def process_result_value(self, value, dialect):  # noqa: PLR6301
+        return None if value is None else str(value)
 
 
 @table_registry.mapped_as_dataclass
 class Book:
     __tablename__ = 'books'
+    __table_args__ = (
+        Index(
+            'ix_books_title_trgm',
+            'title',
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        ),
+        Index('ix_books_author_id_year_id', 'author_id', 'year', 'id'),
+        Index('ix_books_year_id', 'year', 'id'),
+        Index('ix_books_search', 'search', postgresql_using='gin'),
+    )
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     title: Mapped[str] = mapped_column(unique=True)
-    year: Mapped[str]
-    author_id: Mapped[int] = mapped_column(ForeignKey('novelists.id'))
+    title_key: Mapped[str] = normalized_key('title')
+    search: Mapped[str] = search_vector('title')
+    year: Mapped[str] = mapped_column(Year)
+    author_id: Mapped[int] = mapped_column(
+        ForeignKey('novelists.id', ondelete='CASCADE')
+    )
     author: Mapped[Novelist] = relationship(init=False, back_populates='books')
     created_at: Mapped[datetime] = mapped_column(
         init=False,
         server_default=func.now(),
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
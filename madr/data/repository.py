@@ -0,0 +1,47 @@
+from sqlalchemy import Integer, any_, delete, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def insert_or_none(
+    session: AsyncSession, model, conflict=None, **values
+):
+    # ON CONFLICT DO NOTHING: no returned row means a unique key already
+    # exists, so duplicates cost the same single statement as an insert.
+    return await session.scalar(
+        insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=conflict)
+        .returning(model)
+    )
+
+
+async def update_by_id(session: AsyncSession, model, row_id: int, **values):
+    return await session.scalar(
+        update(model)
+        .where(model.id == row_id)
+        .values(**values)
+        .returning(model)
+    )
+
+
+async def delete_by_id(session: AsyncSession, model, row_id: int):
+    return await session.scalar(
+        delete(model).where(model.id == row_id).returning(model.id)
+    )
+
+
+async def get_by_ids(session: AsyncSession, model, ids: list[int]):
+    # One array parameter keeps the statement shape stable for any batch size
+    requested = list(dict.fromkeys(ids))
+    rows = await session.scalars(
+        select(model).where(
+            model.id == any_(literal(requested, ARRAY(Integer)))
+        )
+    )
+
+    found = {row.id: row for row in rows}
+    return (
+        [found[row_id] for row_id in requested if row_id in found],
+        [row_id for row_id in requested if row_id not in found],
+    )
@@ -0,0 +1,98 @@
+from sqlalchemy import (
+    ColumnElement,
+    Double,
+    Select,
+    Subquery,
+    bindparam,
+    func,
+    literal,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.orm import InstrumentedAttribute
+
+from madr.data.models import SEARCH_CONFIG, Book, Novelist
+from madr.utils.sanitize import normalize_key, sanitize_data
+
+LIKE_ESCAPE = '\\'
+
+
+def escape_like(term: str) -> str:
+    return (
+        term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace('%', f'{LIKE_ESCAPE}%')
+        .replace('_', f'{LIKE_ESCAPE}_')
+    )
+
+
+def contains(column: InstrumentedAttribute, term: str) -> ColumnElement:
+    # The pattern is bound as a single literal so the planner can match it
+    # against the pg_trgm GIN index instead of scanning the whole table.
+    return column.like(f'%{escape_like(term)}%', escape=LIKE_ESCAPE)
+
+
+def ranked_matches(term: str, kind: str | None = None) -> Subquery:
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+    query = func.websearch_to_tsquery(config, term)
+    sources = {
+        'book': (Book, Book.title),
+        'novelist': (Novelist, Novelist.name),
+    }
+
+    # Each branch filters on its own GIN index before anything is ranked
+    matches = [
+        select(
+            literal(name).label('type'),
+            model.id,
+            text.label('text'),
+            # As a double the rank survives the cursor's JSON round trip
+            func.ts_rank(model.search, query).cast(Double).label('rank'),
+            model.updated_at,
+        ).where(model.search.bool_op('@@')(query))
+        for name, (model, text) in sources.items()
+        if kind in {None, name}
+    ]
+
+    return matches[0].union_all(*matches[1:]).subquery('matches')
+
+
+def prefix_bounds(term: str) -> tuple[str, str] | None:
+    prefix = normalize_key(sanitize_data(term))
+    if not prefix:
+        return None
+
+    # Unlike a bound LIKE pattern, a range stays an index range in the
+    # generic plans of prepared statements
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def suggestions_query() -> Select:
+    sources = {
+        'book': (Book, Book.title, Book.title_key),
+        'novelist': (Novelist, Novelist.name, Novelist.name_key),
+    }
+    limit = bindparam('limit')
+
+    # Each branch reads at most limit entries off its unique key index
+    matches = union_all(
+        *(
+            select(
+                literal(name).label('type'),
+                model.id,
+                text.label('text'),
+                key.label('key'),
+                model.updated_at,
+            )
+            .where(key >= bindparam('prefix'), key < bindparam('upper'))
+            .order_by(key)
+            .limit(limit)
+            for name, (model, text, key) in sources.items()
+        )
+    ).subquery('suggestions')
+
+    return select(matches).order_by(matches.c.key).limit(limit)
+
+
+# Built once, as only its parameters change from keystroke to keystroke
+SUGGESTIONS = suggestions_query()
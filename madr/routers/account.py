@@ -1,64 +1,115 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from sqlalchemy import select
 
-from madr.config.security import get_password_hash
+from madr.config.security import get_password_hash_async, user_cache
+from madr.data.counting import CountMode, count_rows
 from madr.data.models import Account
+from madr.data.repository import delete_by_id, insert_or_none, update_by_id
 from madr.schemas.account import (
     AccountList,
     AccountPublic,
     AccountSchema,
 )
 from madr.schemas.message import MessageSchema
-from madr.utils.dependencies import T_CurrentUser, T_Session
+from madr.utils.conditional import (
+    collection_validators,
+    conditional_response,
+    entity_validators,
+    is_conditional,
+    is_not_modified,
+    not_modified_response,
+    probe_validators,
+)
+from madr.utils.dependencies import T_CurrentUser, T_ReadSession, T_Session
+from madr.utils.pagination import next_page, paginate
+from madr.utils.serialization import columns_for, encode_page
 
 router = APIRouter(prefix='/users', tags=['account'])
 
 
 @router.post('/', status_code=HTTPStatus.CREATED, response_model=AccountPublic)
 async def create_account(account: AccountSchema, session: T_Session):
-    db_account = await session.scalar(
-        select(Account).where(
-            (Account.username == account.username)
-            | (Account.email == account.email)
-        )
+    db_account = await insert_or_none(
+        session,
+        Account,
+        username=account.username,
+        email=account.email,
+        password=await get_password_hash_async(account.password),
     )
 
-    if db_account:
-        if db_account.username == account.username:
-            raise HTTPException(
-                status_code=HTTPStatus.CONFLICT,
-                detail='Username already exists',
+    if not db_account:
+        existing = await session.scalar(
+            select(Account).where(
+                (Account.username == account.username)
+                | (Account.email == account.email)
             )
-        elif db_account.email == account.email:
+        )
+
+        if existing and existing.username != account.username:
             raise HTTPException(
                 status_code=HTTPStatus.CONFLICT, detail='Email already exists'
             )
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT, detail='Username already exists'
+        )
 
-    db_account = Account(
-        username=account.username,
-        email=account.email,
-        password=get_password_hash(account.password),
-    )
-
-    session.add(db_account)
     await session.commit()
-    await session.refresh(db_account)
 
     return db_account
 
 
 @router.get('/', response_model=AccountList, status_code=HTTPStatus.OK)
-async def list_accounts(session: T_Session, limit: int = 10, skip: int = 0):
-    accounts = await session.scalars(select(Account).limit(limit).offset(skip))
-    return {'users': accounts}
+async def list_accounts(  # noqa
+    request: Request,
+    session: T_ReadSession,
+    limit: int = 10,
+    skip: int = 0,
+    cursor: str | None = None,
+    include_total: bool = False,
+    count_mode: CountMode = 'exact',
+):
+    query = select(*columns_for(AccountPublic, Account, Account.updated_at))
+    accounts = await session.execute(
+        paginate(
+            query,
+            Account.id,
+            limit,
+            cursor=cursor,
+            offset=skip,
+        )
+    )
+    accounts, next_cursor = next_page(accounts.all(), limit, Account.id)
+
+    extra = {}
+    if include_total:
+        extra['total'] = await count_rows(
+            session, query, count_mode, ('accounts',)
+        )
+
+    return conditional_response(
+        request,
+        encode_page(
+            AccountList, 'users', accounts, next_cursor=next_cursor, **extra
+        ),
+        collection_validators(
+            'accounts', accounts, next_cursor, *extra.values()
+        ),
+    )
 
 
 @router.get(
     '/{user_id}', response_model=AccountPublic, status_code=HTTPStatus.OK
 )
-async def get_account_by_id(user_id: int, session: T_Session):
+async def get_account_by_id(
+    user_id: int, request: Request, response: Response, session: T_ReadSession
+):
+    if is_conditional(request):
+        validators = await probe_validators(session, Account, user_id)
+        if validators and is_not_modified(request, validators):
+            return not_modified_response(validators)
+
     account = await session.scalar(
         select(Account).where(Account.id == user_id)
     )
@@ -67,6 +118,10 @@ async def get_account_by_id(user_id: int, session: T_Session):
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='User not found'
         )
+
+    validators = entity_validators('accounts', account.id, account.updated_at)
+    response.headers.update(validators.headers())
+
     return account
 
 
@@ -84,14 +139,21 @@ async def update_account(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permissions'
         )
 
-    current_user.email = account.email
-    current_user.username = account.username
-    current_user.password = get_password_hash(account.password)
+    subject = current_user.email
+
+    db_account = await update_by_id(
+        session,
+        Account,
+        user_id,
+        email=account.email,
+        username=account.username,
+        password=await get_password_hash_async(account.password),
+    )
 
     await session.commit()
-    await session.refresh(current_user)
+    user_cache.pop(subject)
 
-    return current_user
+    return db_account
 
 
 @router.delete(
@@ -105,7 +167,10 @@ async def delete_account(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permissions'
         )
 
-    await session.delete(current_user)
+    subject = current_user.email
+
+    await delete_by_id(session, Account, user_id)
     await session.commit()
+    user_cache.pop(subject)
 
     return {'message': 'User deleted successfully'}
@@ -1,23 +1,31 @@
 from http import HTTPStatus
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 
-from madr.config.security import create_access_token, verify_password
+from madr.config.security import (
+    create_access_token,
+    verify_password_async,
+)
 from madr.data.models import Account
 from madr.schemas.auth import Token
 from madr.utils.dependencies import T_CurrentUser, T_FormData, T_Session
+from madr.utils.ratelimit import limit_login
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 
 
-@router.post('/token', response_model=Token)
+@router.post(
+    '/token', response_model=Token, dependencies=[Depends(limit_login)]
+)
 async def login_for_access_token(session: T_Session, form_data: T_FormData):
     user = await session.scalar(
         select(Account).where(Account.email == form_data.username)
     )
 
-    if not user or not verify_password(form_data.password, user.password):
+    if not user or not await verify_password_async(
+        form_data.password, user.password
+    ):
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Incorrect email or password',
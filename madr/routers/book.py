@@ -1,13 +1,43 @@
 from http import HTTPStatus
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 
+from madr.data import bulk
+from madr.data.counting import CountMode, count_rows
 from madr.data.models import Book
-from madr.schemas.book import BookList, BookPublic, BookSchema, BookUpdate
+from madr.data.repository import (
+    delete_by_id,
+    get_by_ids,
+    insert_or_none,
+    update_by_id,
+)
+from madr.data.search import contains
+from madr.schemas.batch import MAX_BATCH_IDS, BatchIds
+from madr.schemas.book import (
+    BookBatch,
+    BookList,
+    BookPublic,
+    BookSchema,
+    BookUpdate,
+)
+from madr.schemas.bulk import ImportReport
 from madr.schemas.message import MessageSchema
-from madr.utils.dependencies import T_CurrentUser, T_Session
-from madr.utils.sanitize import sanitize_data
+from madr.utils.conditional import (
+    collection_validators,
+    entity_validators,
+    is_conditional,
+    is_not_modified,
+    not_modified_response,
+    probe_validators,
+)
+from madr.utils.dependencies import T_CurrentUser, T_ReadSession, T_Session
+from madr.utils.pagination import next_page, paginate
+from madr.utils.response_cache import respond, response_cache
+from madr.utils.sanitize import normalize_key, sanitize_data
+from madr.utils.serialization import columns_for, encode_page
 
 router = APIRouter(prefix='/books', tags=['books'])
 
@@ -16,54 +46,174 @@ router = APIRouter(prefix='/books', tags=['books'])
 async def create_book(
     book: BookSchema, session: T_Session, user: T_CurrentUser
 ):
-    db_book = await session.scalar(
-        select(Book).where(Book.title == book.title)
+    title = sanitize_data(book.title)
+    db_book = await insert_or_none(
+        session,
+        Book,
+        conflict=[Book.title_key],
+        title=title,
+        title_key=normalize_key(title),
+        year=book.year,
+        author_id=book.author_id,
     )
 
-    if db_book:
+    if not db_book:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT, detail='book already on the MADR'
         )
 
-    db_book = Book(
-        title=sanitize_data(book.title),
-        year=book.year,
-        author_id=book.author_id,
-    )
-
-    session.add(db_book)
     await session.commit()
-    await session.refresh(db_book)
+    response_cache.invalidate('books')
 
     return db_book
 
 
+@router.post('/import', status_code=HTTPStatus.OK, response_model=ImportReport)
+async def import_books(
+    request: Request, session: T_Session, user: T_CurrentUser
+):
+    report = await bulk.import_books(session, request)
+    response_cache.invalidate('books')
+
+    return report
+
+
 @router.get('/', status_code=HTTPStatus.OK, response_model=BookList)
 async def list_books(  # noqa
-    session: T_Session,
+    request: Request,
+    session: T_ReadSession,
     user: T_CurrentUser,
     title: str = Query(None),
-    year: str = Query(None),
+    title_exact: str = Query(None),
+    year: int = Query(None),
+    year_from: int = Query(None),
+    year_to: int = Query(None),
+    sort: Literal['id', 'year', '-year'] = Query('id'),
     offset: int = Query(None),
     limit: int = Query(10),
+    cursor: str = Query(None),
+    include_total: bool = Query(False),
+    count_mode: CountMode = Query('exact'),
 ):
-    query = select(Book)
+    key = response_cache.key(
+        'list_books',
+        title=title,
+        title_exact=title_exact,
+        year=year,
+        year_from=year_from,
+        year_to=year_to,
+        sort=sort,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+    )
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    query = select(*columns_for(BookPublic, Book, Book.updated_at))
 
     if title:
-        query = query.filter(Book.title.contains(title))
+        query = query.filter(contains(Book.title, title))
+
+    if title_exact is not None:
+        # One probe of the unique key index
+        title_key = normalize_key(sanitize_data(title_exact))
+        query = query.filter(Book.title_key == title_key)
 
-    if year:
-        query = query.filter(Book.year.contains(year))
+    if year is not None:
+        query = query.filter(Book.year == year)
 
-    books = await session.scalars(query.offset(offset).limit(limit))
+    if year_from is not None:
+        query = query.filter(Book.year >= year_from)
 
-    return {'books': books}
+    if year_to is not None:
+        query = query.filter(Book.year <= year_to)
+
+    keys = Book.id if sort == 'id' else (Book.year, Book.id)
+    books = await session.execute(
+        paginate(
+            query,
+            keys,
+            limit,
+            cursor=cursor,
+            offset=offset,
+            descending=sort == '-year',
+        )
+    )
+    books, next_cursor = next_page(books.all(), limit, keys)
+
+    extra = {}
+    if include_total:
+        extra['total'] = await count_rows(
+            session,
+            query,
+            count_mode,
+            ('books', title, title_exact, year, year_from, year_to),
+        )
+
+    body = encode_page(
+        BookList, 'books', books, next_cursor=next_cursor, **extra
+    )
+    validators = collection_validators(
+        'books', books, next_cursor, *extra.values()
+    )
+
+    return respond(
+        request, response_cache.store(key, body, validators, 'books')
+    )
+
+
+@router.get('/batch', status_code=HTTPStatus.OK, response_model=BookBatch)
+async def get_books_by_ids(
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    ids: list[int] = Query(min_length=1, max_length=MAX_BATCH_IDS),
+):
+    books, missing = await get_by_ids(session, Book, ids)
+
+    return {'books': books, 'missing': missing}
+
+
+@router.post('/batch', status_code=HTTPStatus.OK, response_model=BookBatch)
+async def post_books_by_ids(
+    batch: BatchIds, session: T_ReadSession, user: T_CurrentUser
+):
+    books, missing = await get_by_ids(session, Book, batch.ids)
+
+    return {'books': books, 'missing': missing}
+
+
+@router.get('/export', status_code=HTTPStatus.OK)
+async def export_books(
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    format: Literal['ndjson', 'csv'] = Query('ndjson'),
+    include_author: bool = Query(False),
+):
+    return StreamingResponse(
+        bulk.export_books(session, format, include_author),
+        media_type=bulk.EXPORT_MEDIA_TYPES[format],
+    )
 
 
 @router.get('/{book_id}', status_code=HTTPStatus.OK, response_model=BookPublic)
 async def get_book_by_id(
-    book_id: int, session: T_Session, user: T_CurrentUser
+    book_id: int,
+    request: Request,
+    session: T_ReadSession,
+    user: T_CurrentUser,
 ):
+    key = response_cache.key('get_book_by_id', book_id=book_id)
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    if is_conditional(request):
+        validators = await probe_validators(session, Book, book_id)
+        if validators and is_not_modified(request, validators):
+            return not_modified_response(validators)
+
     db_book = await session.scalar(select(Book).where(Book.id == book_id))
 
     if not db_book:
@@ -71,7 +221,21 @@ async def get_book_by_id(
             status_code=HTTPStatus.NOT_FOUND, detail='Book not listed in MADR'
         )
 
-    return db_book
+    body = BookPublic.model_validate(
+        db_book, from_attributes=True
+    ).model_dump_json()
+    validators = entity_validators('books', db_book.id, db_book.updated_at)
+
+    return respond(
+        request,
+        response_cache.store(
+            key,
+            body,
+            validators,
+            f'book:{db_book.id}',
+            f'novelist:{db_book.author_id}',
+        ),
+    )
 
 
 @router.patch(
@@ -80,18 +244,15 @@ async def get_book_by_id(
 async def update_book(
     book_id: int, booK: BookUpdate, session: T_Session, user: T_CurrentUser
 ):
-    db_book = await session.scalar(select(Book).where(Book.id == book_id))
+    db_book = await update_by_id(session, Book, book_id, year=booK.year)
 
     if not db_book:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Book not listed in MADR'
         )
 
-    db_book.year = booK.year
-
-    session.add(db_book)
     await session.commit()
-    await session.refresh(db_book)
+    response_cache.invalidate('books', f'book:{book_id}')
 
     return db_book
 
@@ -100,14 +261,14 @@ async def update_book(
     '/{book_id}', status_code=HTTPStatus.OK, response_model=MessageSchema
 )
 async def delete_book(book_id: int, session: T_Session, user: T_CurrentUser):
-    db_book = await session.scalar(select(Book).where(Book.id == book_id))
+    deleted_id = await delete_by_id(session, Book, book_id)
 
-    if not db_book:
+    if not deleted_id:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='Book not listed in MADR'
         )
 
-    await session.delete(db_book)
     await session.commit()
+    response_cache.invalidate('books', f'book:{book_id}')
 
     return {'message': 'Book deleted from MADR'}
@@ -0,0 +1,32 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends
+
+from madr.config.security import require_internal_token, user_cache
+from madr.data.counting import count_cache
+from madr.data.database import engine, read_engine
+from madr.schemas.internal import CachesStats, PoolsStats
+from madr.utils.response_cache import response_cache
+
+router = APIRouter(
+    prefix='/internal',
+    tags=['internal'],
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get('/pool', status_code=HTTPStatus.OK, response_model=PoolsStats)
+async def pool_stats():
+    return {
+        'primary': engine.pool.stats(),
+        'replica': None if read_engine is engine else read_engine.pool.stats(),
+    }
+
+
+@router.get('/cache', status_code=HTTPStatus.OK, response_model=CachesStats)
+async def cache_stats():
+    return {
+        'responses': response_cache.stats(),
+        'users': user_cache.stats(),
+        'counts': count_cache.stats(),
+    }
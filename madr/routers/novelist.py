@@ -1,18 +1,48 @@
 from http import HTTPStatus
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
-from madr.data.models import Novelist
+from madr.data import bulk
+from madr.data.counting import CountMode, count_rows
+from madr.data.models import Book, Novelist
+from madr.data.repository import (
+    delete_by_id,
+    get_by_ids,
+    insert_or_none,
+    update_by_id,
+)
+from madr.data.search import contains
+from madr.schemas.batch import MAX_BATCH_IDS, BatchIds
+from madr.schemas.book import BookList, BookPublic
+from madr.schemas.bulk import ImportReport
 from madr.schemas.message import MessageSchema
 from madr.schemas.novelist import (
+    NovelistBatch,
     NovelistListAll,
     NovelistPublic,
     NovelistSchema,
     NovelistUpdate,
+    NovelistWithBooks,
+)
+from madr.utils.conditional import (
+    Validators,
+    collection_validators,
+    entity_validators,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    probe_validators,
 )
-from madr.utils.dependencies import T_CurrentUser, T_Session
-from madr.utils.sanitize import sanitize_data
+from madr.utils.dependencies import T_CurrentUser, T_ReadSession, T_Session
+from madr.utils.pagination import next_page, paginate
+from madr.utils.response_cache import respond, response_cache
+from madr.utils.sanitize import normalize_key, sanitize_data
+from madr.utils.serialization import columns_for, encode_page
 
 router = APIRouter(prefix='/novelist', tags=['novelist'])
 
@@ -23,51 +53,148 @@ router = APIRouter(prefix='/novelist', tags=['novelist'])
 async def create_novelist(
     novelist: NovelistSchema, user: T_CurrentUser, session: T_Session
 ):
-    db_novelist = await session.scalar(
-        select(Novelist).where(Novelist.name == novelist.name)
+    name = sanitize_data(novelist.name)
+    db_novelist = await insert_or_none(
+        session,
+        Novelist,
+        conflict=[Novelist.name_key],
+        name=name,
+        name_key=normalize_key(name),
     )
 
-    if db_novelist:
+    if not db_novelist:
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='novelist already on the MADR',
         )
 
-    db_novelist = Novelist(name=sanitize_data(novelist.name))
-
-    session.add(db_novelist)
     await session.commit()
-    await session.refresh(db_novelist)
+    response_cache.invalidate('novelists')
 
     return db_novelist
 
 
+@router.post('/import', status_code=HTTPStatus.OK, response_model=ImportReport)
+async def import_novelists(
+    request: Request, session: T_Session, user: T_CurrentUser
+):
+    report = await bulk.import_novelists(session, request)
+    response_cache.invalidate('novelists')
+
+    return report
+
+
 @router.get('/', status_code=HTTPStatus.OK, response_model=NovelistListAll)
-async def list_novelist(
-    session: T_Session,
+async def list_novelist(  # noqa
+    request: Request,
+    session: T_ReadSession,
     user: T_CurrentUser,
     name: str = Query(None),
+    name_exact: str = Query(None),
     offset: int = Query(None),
     limit: int = Query(10),
+    cursor: str = Query(None),
+    include_total: bool = Query(False),
+    count_mode: CountMode = Query('exact'),
 ):
-    query = select(Novelist)
+    key = response_cache.key(
+        'list_novelist',
+        name=name,
+        name_exact=name_exact,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+        count_mode=count_mode,
+    )
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    query = select(*columns_for(NovelistPublic, Novelist, Novelist.updated_at))
     if name:
-        query = query.filter(Novelist.name.contains(name))
+        query = query.filter(contains(Novelist.name, name))
 
-    novelists = await session.scalars(query.offset(offset).limit(limit))
+    if name_exact is not None:
+        # One probe of the unique key index
+        name_key = normalize_key(sanitize_data(name_exact))
+        query = query.filter(Novelist.name_key == name_key)
 
-    return {'novelists': novelists}
+    novelists = await session.execute(
+        paginate(query, Novelist.id, limit, cursor=cursor, offset=offset)
+    )
+    novelists, next_cursor = next_page(novelists.all(), limit, Novelist.id)
+
+    extra = {}
+    if include_total:
+        extra['total'] = await count_rows(
+            session, query, count_mode, ('novelists', name, name_exact)
+        )
+
+    body = encode_page(
+        NovelistListAll,
+        'novelists',
+        novelists,
+        next_cursor=next_cursor,
+        **extra,
+    )
+    validators = collection_validators(
+        'novelists', novelists, next_cursor, *extra.values()
+    )
+
+    return respond(
+        request, response_cache.store(key, body, validators, 'novelists')
+    )
+
+
+@router.get('/batch', status_code=HTTPStatus.OK, response_model=NovelistBatch)
+async def get_novelists_by_ids(
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    ids: list[int] = Query(min_length=1, max_length=MAX_BATCH_IDS),
+):
+    novelists, missing = await get_by_ids(session, Novelist, ids)
+
+    return {'novelists': novelists, 'missing': missing}
+
+
+@router.post('/batch', status_code=HTTPStatus.OK, response_model=NovelistBatch)
+async def post_novelists_by_ids(
+    batch: BatchIds, session: T_ReadSession, user: T_CurrentUser
+):
+    novelists, missing = await get_by_ids(session, Novelist, batch.ids)
+
+    return {'novelists': novelists, 'missing': missing}
 
 
 @router.get(
-    '/{novelist_id}', status_code=HTTPStatus.OK, response_model=NovelistPublic
+    '/{novelist_id}',
+    status_code=HTTPStatus.OK,
+    response_model=NovelistWithBooks,
 )
-async def get_novelist_by_id(
-    novelist_id: int, session: T_Session, user: T_CurrentUser
+async def get_novelist_by_id(  # noqa
+    novelist_id: int,
+    request: Request,
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    include: Literal['books'] = Query(None),
 ):
-    db_novelist = await session.scalar(
-        select(Novelist).where(Novelist.id == novelist_id)
+    key = response_cache.key(
+        'get_novelist_by_id', novelist_id=novelist_id, include=include
     )
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    # With books embedded the version also depends on every book row
+    if include != 'books' and is_conditional(request):
+        validators = await probe_validators(session, Novelist, novelist_id)
+        if validators and is_not_modified(request, validators):
+            return not_modified_response(validators)
+
+    query = select(Novelist).where(Novelist.id == novelist_id)
+    if include == 'books':
+        query = query.options(selectinload(Novelist.books))
+
+    db_novelist = await session.scalar(query)
 
     if not db_novelist:
         raise HTTPException(
@@ -75,44 +202,105 @@ async def get_novelist_by_id(
             detail='Novelist not listed in MADR',
         )
 
-    return db_novelist
+    tags = [f'novelist:{db_novelist.id}']
 
+    if include != 'books':
+        validators = entity_validators(
+            'novelists', db_novelist.id, db_novelist.updated_at
+        )
+        # Never touch the lazy relationship outside the selectinload path
+        body = NovelistPublic.model_validate(
+            db_novelist, from_attributes=True
+        ).model_dump_json()
+    else:
+        validators = Validators(
+            make_etag(
+                'novelists',
+                db_novelist.id,
+                db_novelist.updated_at,
+                collection_validators('books', db_novelist.books).etag,
+            )
+        )
+        body = NovelistWithBooks.model_validate(
+            db_novelist, from_attributes=True
+        ).model_dump_json()
+        tags.append('books')
 
-@router.patch(
-    '/{novelist_id}', status_code=HTTPStatus.OK, response_model=NovelistPublic
+    return respond(request, response_cache.store(key, body, validators, *tags))
+
+
+@router.get(
+    '/{novelist_id}/books', status_code=HTTPStatus.OK, response_model=BookList
 )
-async def update_novelist(
+async def list_novelist_books(  # noqa
     novelist_id: int,
-    novelist: NovelistUpdate,
-    session: T_Session,
+    session: T_ReadSession,
     user: T_CurrentUser,
+    sort: Literal['year', '-year'] = Query('year'),
+    offset: int = Query(None),
+    limit: int = Query(10),
+    cursor: str = Query(None),
 ):
-    db_novelist = await session.scalar(
-        select(Novelist).where(Novelist.id == novelist_id)
+    keys = (Book.year, Book.id)
+    books = await session.execute(
+        paginate(
+            select(*columns_for(BookPublic, Book)).where(
+                Book.author_id == novelist_id
+            ),
+            keys,
+            limit,
+            cursor=cursor,
+            offset=offset,
+            descending=sort == '-year',
+        )
     )
+    books, next_cursor = next_page(books.all(), limit, keys)
 
-    if not db_novelist:
+    if not books and not await session.get(Novelist, novelist_id):
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Novelist not listed in MADR',
         )
 
-    novelist_name = sanitize_data(novelist.name)
-
-    db_novelist_name = await session.scalar(
-        select(Novelist).where(Novelist.name == novelist_name)
+    return Response(
+        encode_page(BookList, 'books', books, next_cursor=next_cursor),
+        media_type='application/json',
     )
-    if db_novelist_name:
+
+
+@router.patch(
+    '/{novelist_id}', status_code=HTTPStatus.OK, response_model=NovelistPublic
+)
+async def update_novelist(
+    novelist_id: int,
+    novelist: NovelistUpdate,
+    session: T_Session,
+    user: T_CurrentUser,
+):
+    name = sanitize_data(novelist.name)
+    try:
+        db_novelist = await update_by_id(
+            session,
+            Novelist,
+            novelist_id,
+            name=name,
+            name_key=normalize_key(name),
+        )
+    except IntegrityError:
+        await session.rollback()
         raise HTTPException(
             status_code=HTTPStatus.CONFLICT,
             detail='novelist already on the MADR',
         )
 
-    db_novelist.name = novelist_name
+    if not db_novelist:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail='Novelist not listed in MADR',
+        )
 
-    session.add(db_novelist)
     await session.commit()
-    await session.refresh(db_novelist)
+    response_cache.invalidate('novelists', f'novelist:{novelist_id}')
 
     return db_novelist
 
@@ -123,17 +311,16 @@ async def update_novelist(
 async def delete_novelist(
     novelist_id: int, session: T_Session, user: T_CurrentUser
 ):
-    db_novelist = await session.scalar(
-        select(Novelist).where(Novelist.id == novelist_id)
-    )
+    deleted_id = await delete_by_id(session, Novelist, novelist_id)
 
-    if not db_novelist:
+    if not deleted_id:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail='Novelist not listed in MADR',
         )
 
-    await session.delete(db_novelist)
     await session.commit()
+    # Deleting a novelist cascades to its books
+    response_cache.invalidate('novelists', 'books', f'novelist:{novelist_id}')
 
     return {'message': 'Novelist deleted from MADR'}
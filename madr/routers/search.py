@@ -0,0 +1,89 @@
+from http import HTTPStatus
+from typing import Literal
+
+from fastapi import APIRouter, Query, Request
+from sqlalchemy import select
+
+from madr.data.search import SUGGESTIONS, prefix_bounds, ranked_matches
+from madr.schemas.search import MAX_SUGGESTIONS, SearchResults, Suggestions
+from madr.utils.conditional import collection_validators
+from madr.utils.dependencies import T_CurrentUser, T_ReadSession
+from madr.utils.pagination import next_page, paginate
+from madr.utils.response_cache import respond, response_cache
+from madr.utils.serialization import encode_page
+
+router = APIRouter(tags=['search'])
+
+
+@router.get('/search', status_code=HTTPStatus.OK, response_model=SearchResults)
+async def search(  # noqa
+    request: Request,
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    q: str = Query(min_length=1, max_length=100),
+    kind: Literal['book', 'novelist'] = Query(None, alias='type'),
+    offset: int = Query(None),
+    limit: int = Query(10),
+    cursor: str = Query(None),
+):
+    key = response_cache.key(
+        'search', q=q, kind=kind, offset=offset, limit=limit, cursor=cursor
+    )
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    matches = ranked_matches(q, kind)
+    keys = (matches.c.rank, matches.c.type, matches.c.id)
+    results = await session.execute(
+        paginate(
+            select(matches),
+            keys,
+            limit,
+            cursor=cursor,
+            offset=offset,
+            descending=True,
+        )
+    )
+    results, next_cursor = next_page(results.all(), limit, keys)
+
+    body = encode_page(
+        SearchResults, 'results', results, next_cursor=next_cursor
+    )
+    validators = collection_validators('search', results, next_cursor)
+
+    return respond(
+        request,
+        response_cache.store(key, body, validators, 'books', 'novelists'),
+    )
+
+
+@router.get(
+    '/autocomplete', status_code=HTTPStatus.OK, response_model=Suggestions
+)
+async def autocomplete(
+    request: Request,
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=MAX_SUGGESTIONS),
+):
+    key = response_cache.key('autocomplete', q=q, limit=limit)
+    if cached := response_cache.lookup(request, key):
+        return respond(request, cached)
+
+    suggestions = []
+    if bounds := prefix_bounds(q):
+        prefix, upper = bounds
+        suggestions = (
+            await session.execute(
+                SUGGESTIONS, {'prefix': prefix, 'upper': upper, 'limit': limit}
+            )
+        ).all()
+
+    body = encode_page(Suggestions, 'suggestions', suggestions)
+    validators = collection_validators('autocomplete', suggestions)
+
+    return respond(
+        request,
+        response_cache.store(key, body, validators, 'books', 'novelists'),
+    )
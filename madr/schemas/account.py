@@ -22,3 +22,10 @@ class AccountPublic(BaseModel):
 
 class AccountList(BaseModel):
     users: list[AccountPublic]
+    next_cursor: Annotated[
+        str | None, Field(description='cursor of the next page')
+    ] = None
+    total: Annotated[
+        int | None,
+        Field(description='matching rows, with ?include_total=true'),
+    ] = None
@@ -0,0 +1,16 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_IDS = 500
+
+
+class BatchIds(BaseModel):
+    ids: Annotated[
+        list[int],
+        Field(
+            description='IDs to fetch',
+            min_length=1,
+            max_length=MAX_BATCH_IDS,
+        ),
+    ]
@@ -44,6 +44,18 @@ class BookPublic(BookSchema):
 
 class BookList(BaseModel):
     books: list[BookPublic]
+    next_cursor: Annotated[
+        str | None, Field(description='cursor of the next page')
+    ] = None
+    total: Annotated[
+        int | None,
+        Field(description='matching rows, with ?include_total=true'),
+    ] = None
+
+
+class BookBatch(BaseModel):
+    books: list[BookPublic]
+    missing: Annotated[list[int], Field(description='IDs not found')]
 
 
 class BookUpdate(BaseModel):
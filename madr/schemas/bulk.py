@@ -0,0 +1,17 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class ImportRowError(BaseModel):
+    line: Annotated[int, Field(description='line number in the upload')]
+    detail: Annotated[str, Field(description='why the row was rejected')]
+
+
+class ImportReport(BaseModel):
+    inserted: Annotated[int, Field(description='rows inserted')]
+    rejected: Annotated[int, Field(description='rows rejected')]
+    errors: Annotated[
+        list[ImportRowError],
+        Field(description='rejected rows, capped at IMPORT_MAX_ERRORS'),
+    ]
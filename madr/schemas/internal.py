@@ -0,0 +1,46 @@
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+
+
+class PoolStats(BaseModel):
+    size: Annotated[int, Field(description='configured pool size')]
+    max_overflow: Annotated[int, Field(description='allowed overflow')]
+    checked_out: Annotated[int, Field(description='connections in use')]
+    idle: Annotated[int, Field(description='connections idle in the pool')]
+    overflow: Annotated[int, Field(description='overflow connections open')]
+    checkouts: Annotated[int, Field(description='checkouts since start')]
+    checkout_timeouts: Annotated[
+        int, Field(description='checkouts that hit pool_timeout')
+    ]
+    wait_time_seconds: Annotated[
+        float, Field(description='total time spent waiting for checkouts')
+    ]
+
+
+class PoolsStats(BaseModel):
+    primary: PoolStats
+    replica: Annotated[
+        PoolStats | None,
+        Field(description='read replica pool, null without READ_DATABASE_URL'),
+    ]
+
+
+class CacheStats(BaseModel):
+    size: Annotated[int, Field(description='live entries')]
+    maxsize: Annotated[int, Field(description='entries before LRU eviction')]
+    hits: Annotated[int, Field(description='lookups served from the cache')]
+    misses: Annotated[int, Field(description='lookups that missed')]
+    hit_ratio: Annotated[float, Field(description='hits over lookups')]
+
+
+class ResponseCacheStats(CacheStats):
+    memory_bytes: Annotated[
+        int, Field(description='bytes held by cached response bodies')
+    ]
+
+
+class CachesStats(BaseModel):
+    responses: ResponseCacheStats
+    users: CacheStats
+    counts: CacheStats
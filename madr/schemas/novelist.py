@@ -2,6 +2,8 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field
 
+from madr.schemas.book import BookPublic
+
 
 class NovelistSchema(BaseModel):
     name: Annotated[str, Field(description='name of novelist', max_length=40)]
@@ -11,8 +13,27 @@ class NovelistPublic(NovelistSchema):
     id: Annotated[int, Field(description='ID of novelist')]
 
 
+class NovelistWithBooks(NovelistPublic):
+    books: Annotated[
+        list[BookPublic] | None,
+        Field(description='books of the novelist, with ?include=books'),
+    ] = None
+
+
 class NovelistListAll(BaseModel):
     novelists: list[NovelistPublic]
+    next_cursor: Annotated[
+        str | None, Field(description='cursor of the next page')
+    ] = None
+    total: Annotated[
+        int | None,
+        Field(description='matching rows, with ?include_total=true'),
+    ] = None
+
+
+class NovelistBatch(BaseModel):
+    novelists: list[NovelistPublic]
+    missing: Annotated[list[int], Field(description='IDs not found')]
 
 
 class NovelistUpdate(BaseModel):
@@ -0,0 +1,45 @@
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+MAX_SUGGESTIONS = 20
+
+
+class SearchHit(BaseModel):
+    type: Annotated[
+        Literal['book', 'novelist'], Field(description='kind of match')
+    ]
+    id: Annotated[int, Field(description='ID of the book or novelist')]
+    text: Annotated[
+        str,
+        Field(
+            description='title of the book or name of the novelist',
+            examples=['dom casmurro'],
+        ),
+    ]
+    rank: Annotated[float, Field(description='relevance, best first')]
+
+
+class SearchResults(BaseModel):
+    results: list[SearchHit]
+    next_cursor: Annotated[
+        str | None, Field(description='cursor of the next page')
+    ] = None
+
+
+class Suggestion(BaseModel):
+    type: Annotated[
+        Literal['book', 'novelist'], Field(description='kind of suggestion')
+    ]
+    id: Annotated[int, Field(description='ID of the book or novelist')]
+    text: Annotated[
+        str,
+        Field(
+            description='title of the book or name of the novelist',
+            examples=['dom casmurro'],
+        ),
+    ]
+
+
+class Suggestions(BaseModel):
+    suggestions: list[Suggestion]
@@ -0,0 +1,98 @@
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import blake2b
+from http import HTTPStatus
+from typing import NamedTuple
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: datetime | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers = {'ETag': self.etag}
+        if self.last_modified:
+            headers['Last-Modified'] = format_datetime(
+                self.last_modified.replace(tzinfo=UTC), usegmt=True
+            )
+        return headers
+
+
+def make_etag(*parts) -> str:
+    digest = blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def entity_validators(
+    kind: str, row_id: int, updated_at: datetime
+) -> Validators:
+    return Validators(make_etag(kind, row_id, updated_at), updated_at)
+
+
+def collection_validators(kind: str, rows: list, *extra) -> Validators:
+    # No Last-Modified: a deleted row never bumps the max updated_at
+    versions = [(row.id, row.updated_at) for row in rows]
+    return Validators(make_etag(kind, versions, *extra))
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return 'if-none-match' in headers or 'if-modified-since' in headers
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        tags = {
+            tag.strip().removeprefix('W/') for tag in if_none_match.split(',')
+        }
+        return '*' in tags or validators.etag in tags
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and validators.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=UTC)
+
+        modified = validators.last_modified.replace(tzinfo=UTC, microsecond=0)
+        return modified <= since
+
+    return False
+
+
+def not_modified_response(validators: Validators) -> Response:
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED, headers=validators.headers()
+    )
+
+
+def conditional_response(
+    request: Request, body: bytes, validators: Validators
+) -> Response:
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    return Response(
+        body, media_type='application/json', headers=validators.headers()
+    )
+
+
+async def probe_validators(
+    session: AsyncSession, model: type, row_id: int
+) -> Validators | None:
+    updated_at = await session.scalar(
+        select(model.updated_at).where(model.id == row_id)
+    )
+
+    if updated_at is None:
+        return None
+
+    return entity_validators(model.__tablename__, row_id, updated_at)
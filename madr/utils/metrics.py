@@ -0,0 +1,155 @@
+from bisect import bisect_left
+from collections import defaultdict
+from time import perf_counter
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+UNMATCHED = '<unmatched>'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            cumulative += count
+            yield str(bound), cumulative
+
+
+def labels(**values) -> str:
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"'))
+        for name, value in values.items()
+    )
+    return ','.join(f'{name}="{value}"' for name, value in escaped)
+
+
+class Metrics:
+    def __init__(self):
+        self.in_flight = 0
+        self.requests: defaultdict[tuple, int] = defaultdict(int)
+        self.latency: dict[tuple, Histogram] = {}
+        self.sizes: dict[tuple, Histogram] = {}
+
+    def observe(  # noqa: PLR0913, PLR0917
+        self, method: str, route: str, status: int, seconds: float, size: int
+    ):
+        key = method, route
+        self.requests[key, status] += 1
+
+        if key not in self.latency:
+            self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.sizes[key] = Histogram(SIZE_BUCKETS)
+
+        self.latency[key].observe(seconds)
+        self.sizes[key].observe(size)
+
+    def clear(self):
+        self.in_flight = 0
+        self.requests.clear()
+        self.latency.clear()
+        self.sizes.clear()
+
+    def render(self) -> str:
+        lines = [
+            '# HELP madr_http_requests_in_flight Requests being served.',
+            '# TYPE madr_http_requests_in_flight gauge',
+            f'madr_http_requests_in_flight {self.in_flight}',
+            '# HELP madr_http_requests_total Requests by route and status.',
+            '# TYPE madr_http_requests_total counter',
+        ]
+        for ((method, route), status), count in sorted(self.requests.items()):
+            tags = labels(method=method, route=route, status=status)
+            lines.append(f'madr_http_requests_total{{{tags}}} {count}')
+
+        for name, help_text, histograms in (
+            (
+                'madr_http_request_duration_seconds',
+                'Time to serve a request.',
+                self.latency,
+            ),
+            (
+                'madr_http_response_size_bytes',
+                'Response body size.',
+                self.sizes,
+            ),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (method, route), histogram in sorted(histograms.items()):
+                tags = labels(method=method, route=route)
+                lines += [
+                    f'{name}_bucket{{{tags},le="{bound}"}} {count}'
+                    for bound, count in histogram.samples()
+                ]
+                lines += [
+                    f'{name}_sum{{{tags}}} {histogram.sum}',
+                    f'{name}_count{{{tags}}} {histogram.count}',
+                ]
+
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            # The router stores the matched route in the shared scope; label
+            # by its template so path parameters do not explode cardinality
+            route = scope.get('route')
+            metrics.observe(
+                scope['method'],
+                getattr(route, 'path', UNMATCHED),
+                status,
+                perf_counter() - start,
+                size,
+            )
+
+
+metrics = Metrics()
@@ -0,0 +1,86 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as DecodeError
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, Integer, Select, TypeDecorator, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+Keys = InstrumentedAttribute | tuple[InstrumentedAttribute, ...]
+INT4_MIN, INT4_MAX = -(2**31), 2**31 - 1
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps(values, separators=(',', ':')).encode()
+    return urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def check_cursor_value(key, value):
+    key_type = key.type
+    if type(value) is not key_type.python_type:
+        raise ValueError
+
+    # Run the key's own bind conversion now, so a value the database would
+    # reject fails here as a bad cursor instead of at execute time
+    if isinstance(key_type, TypeDecorator):
+        value = key_type.process_bind_param(value, None)
+        key_type = key_type.impl_instance
+
+    if isinstance(key_type, Integer) and not isinstance(key_type, BigInteger):
+        if not INT4_MIN <= value <= INT4_MAX:
+            raise ValueError
+
+
+def decode_cursor(cursor: str, keys: tuple) -> tuple:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError
+
+        for key, value in zip(keys, values):
+            check_cursor_value(key, value)
+
+        return tuple(values)
+
+    except (DecodeError, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+        )
+
+
+def paginate(  # noqa: PLR0913, PLR0917
+    query: Select,
+    keys: Keys,
+    limit: int,
+    cursor: str | None = None,
+    offset: int | None = None,
+    descending: bool = False,
+) -> Select:
+    keys = keys if isinstance(keys, tuple) else (keys,)
+    query = query.order_by(
+        *(key.desc() if descending else key for key in keys)
+    )
+
+    if cursor:
+        position = tuple_(*keys)
+        # Bound through the keys' own types, which may differ from the JSON's
+        last = decode_cursor(cursor, keys)
+        query = query.where(position < last if descending else position > last)
+    elif offset:
+        query = query.offset(offset)
+
+    return query.limit(max(limit, 0) + 1)
+
+
+def next_page(rows: list, limit: int, keys: Keys) -> tuple[list, str | None]:
+    if limit < 1:
+        return [], None
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    keys = keys if isinstance(keys, tuple) else (keys,)
+    return rows, encode_cursor(*(getattr(rows[-1], key.key) for key in keys))
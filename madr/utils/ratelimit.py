@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http import HTTPStatus
+from ipaddress import ip_address, ip_network
+from math import ceil
+from time import monotonic
+from typing import NamedTuple
+
+from fastapi import HTTPException, Request
+
+from madr.config.settings import Settings
+from madr.utils.dependencies import T_FormData
+
+settings = Settings()
+
+
+class RateLimit(NamedTuple):
+    name: str
+    per_minute: float
+    burst: int
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: str, rate: float, capacity: int) -> float:
+        # Take one token: 0.0 on success, else seconds until one refills
+        ...
+
+
+class MemoryBackend(RateLimitBackend):
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, rate: float, capacity: int) -> float:
+        now = monotonic()
+        tokens, updated = self._buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+
+        return wait
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class RateLimiter:
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+
+    async def check(self, limit: RateLimit, value: str):
+        if limit.per_minute <= 0:
+            return
+
+        wait = await self.backend.take(
+            f'{limit.name}:{value}', limit.per_minute / 60, limit.burst
+        )
+
+        if wait:
+            raise HTTPException(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                detail='Too many login attempts',
+                headers={'Retry-After': str(ceil(wait))},
+            )
+
+
+LOGIN_BY_IP = RateLimit(
+    'login-ip', settings.LOGIN_IP_PER_MINUTE, settings.LOGIN_IP_BURST
+)
+LOGIN_BY_USERNAME = RateLimit(
+    'login-username',
+    settings.LOGIN_USERNAME_PER_MINUTE,
+    settings.LOGIN_USERNAME_BURST,
+)
+
+login_limiter = RateLimiter(MemoryBackend(settings.RATE_LIMIT_MAX_KEYS))
+trusted_proxies = [ip_network(proxy) for proxy in settings.TRUSTED_PROXIES]
+
+
+def is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ip_address(host)
+    except ValueError:
+        return False
+
+    return any(address in network for network in trusted_proxies)
+
+
+def client_address(request: Request) -> str:
+    host = request.client.host if request.client else 'unknown'
+    if not is_trusted_proxy(host):
+        return host
+
+    # Walk X-Forwarded-For from the right: the first hop that is not one of
+    # our proxies is the client, anything left of it could be forged
+    forwarded = ','.join(request.headers.getlist('x-forwarded-for'))
+    hops = [hop.strip() for hop in forwarded.split(',') if hop.strip()]
+    for hop in reversed(hops):
+        host = hop
+        if not is_trusted_proxy(host):
+            break
+
+    return host
+
+
+async def limit_login(request: Request, form_data: T_FormData):
+    client = client_address(request)
+
+    await login_limiter.check(LOGIN_BY_IP, client)
+    await login_limiter.check(
+        LOGIN_BY_USERNAME, form_data.username.strip().lower()
+    )
@@ -0,0 +1,81 @@
+from typing import Hashable, NamedTuple
+
+from fastapi import Request, Response
+
+from madr.config.settings import Settings
+from madr.utils.cache import TTLCache
+from madr.utils.conditional import Validators, conditional_response
+
+settings = Settings()
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    validators: Validators
+    tags: frozenset[str]
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int, ttl: float, replica_lag: float = 0):
+        self.entries = TTLCache(maxsize, ttl)
+        # Tags written within the lag window, where a replica read may
+        # still return the rows from before the write
+        self.recent_writes = TTLCache(maxsize, replica_lag)
+
+    @staticmethod
+    def key(route: str, **params) -> Hashable:
+        return route, tuple(sorted(params.items()))
+
+    def lookup(self, request: Request, key: Hashable) -> CachedResponse | None:
+        # Users inside their read-your-writes window skip shared entries
+        if getattr(request.state, 'fresh_reads', False):
+            return None
+
+        return self.entries.get(key)
+
+    def store(
+        self,
+        key: Hashable,
+        body: str | bytes,
+        validators: Validators,
+        *tags: str,
+    ) -> CachedResponse:
+        if isinstance(body, str):
+            body = body.encode()
+
+        cached = CachedResponse(body, validators, frozenset(tags))
+        if not any(tag in self.recent_writes for tag in tags):
+            self.entries.set(key, cached)
+        return cached
+
+    def invalidate(self, *tags: str):
+        for tag in tags:
+            self.recent_writes.set(tag, True)
+
+        stale = set(tags)
+        for key, cached in self.entries.items():
+            if cached.tags & stale:
+                self.entries.pop(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.recent_writes.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.entries.stats(),
+            'memory_bytes': sum(
+                len(cached.body) for _, cached in self.entries.items()
+            ),
+        }
+
+
+def respond(request: Request, cached: CachedResponse) -> Response:
+    return conditional_response(request, cached.body, cached.validators)
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_SIZE,
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.READ_YOUR_WRITES_SECONDS if settings.READ_DATABASE_URL else 0,
+)
@@ -1,4 +1,5 @@
 import string
+import unicodedata
 
 
 def sanitize_data(data: str) -> str:
@@ -9,3 +10,15 @@ def sanitize_data(data: str) -> str:
         for char in data
     )
     return ' '.join(sanitized.split()).lower()
+
+
+def fold_accents(data: str) -> str:
+    return ''.join(
+        char
+        for char in unicodedata.normalize('NFKD', data)
+        if not unicodedata.combining(char)
+    )
+
+
+def normalize_key(data: str) -> str:
+    return sanitize_data(fold_accents(data))
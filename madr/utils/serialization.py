@@ -0,0 +1,35 @@
+from typing import Sequence, get_args
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy.orm import InstrumentedAttribute
+
+from madr.config.settings import Settings
+
+settings = Settings()
+
+
+def item_schema(schema: type[BaseModel], field: str) -> type[BaseModel]:
+    return get_args(schema.model_fields[field].annotation)[0]
+
+
+def columns_for(
+    schema: type[BaseModel], model: type, *extra: InstrumentedAttribute
+) -> list[InstrumentedAttribute]:
+    return [getattr(model, name) for name in schema.model_fields] + [*extra]
+
+
+def encode_page(
+    schema: type[BaseModel], field: str, rows: Sequence, **extra
+) -> bytes:
+    if not settings.FAST_JSON:
+        return (
+            schema.model_validate({field: rows, **extra}, from_attributes=True)
+            .model_dump_json(exclude_unset=True)
+            .encode()
+        )
+
+    # Rows come straight from the database, so they are trusted as-is
+    names = tuple(item_schema(schema, field).model_fields)
+    items = [{name: getattr(row, name) for name in names} for row in rows]
+    return orjson.dumps({field: items, **extra})
@@ -0,0 +1,94 @@
+"""add normalized title and name keys
+
+Revision ID: 0a6d93f4c8b1
+Revises: e7a15c3b9d20
+Create Date: 2026-10-18 22:14:09.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from madr.utils.sanitize import normalize_key
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d93f4c8b1'
+down_revision: Union[str, None] = 'e7a15c3b9d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+MAX_REPORTED = 20
+
+
+def backfill(table: str, column: str, key: str) -> None:
+    # The keys follow the application's Python rules, so they are computed
+    # here rather than approximated in SQL
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.text(
+            f'SELECT id, {column} FROM {table} WHERE id > :last_id '
+            'ORDER BY id LIMIT :limit'
+        ),
+        {'last_id': last_id, 'limit': BATCH_SIZE},
+    ).all():
+        conn.execute(
+            sa.text(
+                f'UPDATE {table} SET {key} = data.key '
+                'FROM unnest(CAST(:ids AS integer[]), CAST(:keys AS text[])) '
+                f'AS data(id, key) WHERE {table}.id = data.id'
+            ),
+            {
+                'ids': [row_id for row_id, _ in rows],
+                'keys': [normalize_key(value) for _, value in rows],
+            },
+        )
+        last_id = rows[-1][0]
+
+
+def check_duplicates(table: str, key: str) -> None:
+    # Accent folding is new, so rows like 'ação' and 'acao' coexist today
+    # but share a key. Merging them would drop data, so the upgrade stops
+    # with the colliding ids and the rows must be renamed or merged first
+    duplicates = op.get_bind().execute(
+        sa.text(
+            f'SELECT {key}, array_agg(id ORDER BY id) FROM {table} '
+            f'GROUP BY {key} HAVING count(*) > 1 ORDER BY {key} '
+            'LIMIT :limit'
+        ),
+        {'limit': MAX_REPORTED},
+    ).all()
+
+    if duplicates:
+        report = '\n'.join(
+            f'  {value!r}: ids {ids}' for value, ids in duplicates
+        )
+        raise RuntimeError(
+            f'{table}.{key} would not be unique; rename or merge these rows '
+            f'and upgrade again (first {MAX_REPORTED} shown):\n{report}'
+        )
+
+
+def upgrade() -> None:
+    op.add_column('books', sa.Column('title_key', sa.String(), nullable=True))
+    op.add_column('novelists', sa.Column('name_key', sa.String(), nullable=True))
+
+    backfill('books', 'title', 'title_key')
+    backfill('novelists', 'name', 'name_key')
+    check_duplicates('books', 'title_key')
+    check_duplicates('novelists', 'name_key')
+
+    op.alter_column('books', 'title_key', nullable=False)
+    op.alter_column('novelists', 'name_key', nullable=False)
+    op.create_unique_constraint(None, 'books', ['title_key'])
+    op.create_unique_constraint(None, 'novelists', ['name_key'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('novelists_name_key_key', 'novelists', type_='unique')
+    op.drop_constraint('books_title_key_key', 'books', type_='unique')
+    op.drop_column('novelists', 'name_key')
+    op.drop_column('books', 'title_key')
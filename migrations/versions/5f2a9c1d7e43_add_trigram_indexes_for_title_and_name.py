@@ -0,0 +1,30 @@
+"""add trigram indexes for books title and novelists name
+
+Revision ID: 5f2a9c1d7e43
+Revises: 1c42aa07277b
+Create Date: 2026-10-18 17:52:10.418213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f2a9c1d7e43'
+down_revision: Union[str, None] = '1c42aa07277b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_books_title_trgm', 'books', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_novelists_name_trgm', 'novelists', ['name'], unique=False, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_novelists_name_trgm', table_name='novelists', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.drop_index('ix_books_title_trgm', table_name='books', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.execute('DROP EXTENSION IF EXISTS pg_trgm')
@@ -0,0 +1,40 @@
+"""collate normalized keys bytewise
+
+Revision ID: 7c7dc4438d00
+Revises: f883b5976714
+Create Date: 2026-10-19 00:12:37.902264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c7dc4438d00'
+down_revision: Union[str, None] = 'f883b5976714'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('books', 'title_key',
+               existing_type=sa.String(),
+               type_=sa.String(collation='C'),
+               existing_nullable=False)
+    op.alter_column('novelists', 'name_key',
+               existing_type=sa.String(),
+               type_=sa.String(collation='C'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('novelists', 'name_key',
+               existing_type=sa.String(collation='C'),
+               type_=sa.String(),
+               existing_nullable=False)
+    op.alter_column('books', 'title_key',
+               existing_type=sa.String(collation='C'),
+               type_=sa.String(),
+               existing_nullable=False)
@@ -0,0 +1,28 @@
+"""cascade book deletes from novelists
+
+Revision ID: 9b7e4d2c1a05
+Revises: 5f2a9c1d7e43
+Create Date: 2026-10-18 18:41:27.902116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7e4d2c1a05'
+down_revision: Union[str, None] = '5f2a9c1d7e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key('books_author_id_fkey', 'books', 'novelists', ['author_id'], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    op.drop_constraint('books_author_id_fkey', 'books', type_='foreignkey')
+    op.create_foreign_key('books_author_id_fkey', 'books', 'novelists', ['author_id'], ['id'])
@@ -1,7 +1,10 @@
+from contextlib import contextmanager
+
 import pytest
 from factory import Factory, LazyAttribute, Sequence
 from faker.generator import Generator
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -10,11 +13,21 @@ from sqlalchemy.ext.asyncio import (
 from testcontainers.postgres import PostgresContainer
 
 from madr.app import app
-from madr.config.security import get_password_hash
-from madr.data.database import get_async_session
+from madr.config import security
+from madr.config.security import get_password_hash, user_cache
+from madr.data.counting import count_cache
+from madr.data.database import (
+    get_async_read_session,
+    get_async_session,
+    recent_writers,
+)
+from madr.data.instrumentation import instrument, track_queries
 from madr.data.models import Account, Book, Novelist, table_registry
 from madr.schemas.book import BookPublic
 from madr.schemas.novelist import NovelistPublic
+from madr.utils.metrics import metrics
+from madr.utils.ratelimit import login_limiter
+from madr.utils.response_cache import response_cache
 
 
 class AccountFactory(Factory):
@@ -38,15 +51,27 @@ class BookFactory(Factory):
         model = Book
 
     title = Sequence(lambda x: f'test title {x}')
-    year = Sequence(lambda y: f'20{y}')
+    year = Sequence(lambda y: f'20{y % 100}')
     author_id = 1
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    user_cache.clear()
+    response_cache.clear()
+    count_cache.clear()
+    recent_writers.clear()
+    login_limiter.backend.clear()
+    metrics.clear()
+
+
 @pytest.fixture(scope='session')
 def engine():
     with PostgresContainer('postgres:16', driver='psycopg') as postgres:
         # postgres.driver = 'asyncpg'
-        yield create_async_engine(postgres.get_connection_url())
+        engine = create_async_engine(postgres.get_connection_url())
+        instrument(engine)
+        yield engine
 
 
 @pytest.fixture
@@ -70,6 +95,7 @@ async def client(session: AsyncSession):
         yield session
 
     app.dependency_overrides[get_async_session] = get_session_override
+    app.dependency_overrides[get_async_read_session] = get_session_override
 
     async with AsyncClient(app=app, base_url='http://test') as test_client:
         yield test_client
@@ -77,6 +103,47 @@ async def client(session: AsyncSession):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def _session_per_request(client: AsyncClient, engine: AsyncEngine):
+    async def get_session_override():
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = get_session_override
+    app.dependency_overrides[get_async_read_session] = get_session_override
+
+
+@pytest.fixture
+def query_counter(engine: AsyncEngine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+    yield statements
+    event.remove(
+        engine.sync_engine, 'before_cursor_execute', before_cursor_execute
+    )
+
+
+@pytest.fixture
+def max_queries(engine: AsyncEngine):
+    @contextmanager
+    def budget(limit: int):
+        with track_queries() as stats:
+            yield stats
+
+        assert stats.count <= limit, (
+            f'{stats.count} queries over a budget of {limit}',
+            stats.statements,
+        )
+
+    return budget
+
+
 @pytest.fixture
 async def user(faker: Generator, session: AsyncSession) -> Account:
     password = faker.password()
@@ -115,6 +182,12 @@ async def token(client: AsyncClient, user: Account):
     return response.json()['access_token']
 
 
+@pytest.fixture
+def internal_headers(monkeypatch: pytest.MonkeyPatch) -> dict:
+    monkeypatch.setattr(security.settings, 'INTERNAL_TOKEN', 'internal')
+    return {'X-Internal-Token': 'internal'}
+
+
 @pytest.fixture
 async def novelist(session: AsyncSession) -> NovelistPublic:
     novelist = NovelistFactory()
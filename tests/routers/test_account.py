@@ -1,9 +1,13 @@
+import asyncio
+from collections import Counter
 from http import HTTPStatus
 
 import pytest
 from faker import Faker
 from httpx import AsyncClient
+from jwt import encode
 
+from madr.data.database import recent_writers
 from madr.data.models import Account
 from madr.schemas.account import AccountPublic
 
@@ -21,6 +25,25 @@ async def test_create_account(client: AsyncClient, faker: Faker):
     assert response.json() == expect | {'id': 1}
 
 
+async def test_create_account_with_forged_token_does_not_mark_writer(
+    client: AsyncClient, faker: Faker, user: Account
+):
+    forged = encode({'sub': user.email}, 'not-the-secret', algorithm='HS256')
+
+    response = await client.post(
+        '/users/',
+        headers={'Authorization': f'Bearer {forged}'},
+        json={
+            'username': faker.user_name(),
+            'email': faker.email(),
+            'password': faker.password(),
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert user.email not in recent_writers
+
+
 @pytest.mark.asyncio
 async def test_create_user_with_already_existing_username(
     client: AsyncClient, faker: Faker, user: Account
@@ -60,7 +83,7 @@ async def test_read_account_without_data(client: AsyncClient):
     response = await client.get('/users/')
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': []}
+    assert response.json() == {'users': [], 'next_cursor': None}
 
 
 @pytest.mark.asyncio
@@ -70,7 +93,20 @@ async def test_read_account_with_data(client: AsyncClient, user: Account):
     response = await client.get('/users/')
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'users': [account]}
+    assert response.json() == {'users': [account], 'next_cursor': None}
+
+
+@pytest.mark.asyncio
+async def test_read_account_with_total(client: AsyncClient, user: Account):
+    account = AccountPublic.model_validate(user).model_dump()
+
+    response = await client.get('/users/?include_total=true')
+
+    assert response.json() == {
+        'users': [account],
+        'next_cursor': None,
+        'total': 1,
+    }
 
 
 @pytest.mark.asyncio
@@ -174,3 +210,70 @@ async def test_delete_account_not_enough_permissions(
 
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert response.json() == {'detail': 'Not enough permissions'}
+
+
+@pytest.mark.asyncio
+async def test_read_account_with_cursor(
+    client: AsyncClient, user: Account, other_user: Account
+):
+    first_page = await client.get('/users/?limit=1')
+    cursor = first_page.json()['next_cursor']
+
+    response = await client.get(f'/users/?limit=1&cursor={cursor}')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'users': [AccountPublic.model_validate(other_user).model_dump()],
+        'next_cursor': None,
+    }
+
+
+@pytest.mark.usefixtures('_session_per_request')
+async def test_create_account_concurrently_with_return_one_created(
+    client: AsyncClient, faker: Faker
+):
+    parallel_requests = 5
+    account = {
+        'username': 'concurrent',
+        'email': faker.email(),
+        'password': faker.password(),
+    }
+
+    responses = await asyncio.gather(
+        *(
+            client.post('/users/', json=account)
+            for _ in range(parallel_requests)
+        )
+    )
+
+    assert Counter(response.status_code for response in responses) == {
+        HTTPStatus.CREATED: 1,
+        HTTPStatus.CONFLICT: parallel_requests - 1,
+    }
+
+
+async def test_get_account_by_id_with_etag_return_not_modified(
+    client: AsyncClient, user: Account, token: str
+):
+    response = await client.get(f'/users/{user.id}')
+    etag = response.headers['etag']
+
+    cached = await client.get(
+        f'/users/{user.id}', headers={'If-None-Match': f'W/{etag}'}
+    )
+    await client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'renamed',
+            'email': user.email,
+            'password': user.clean_password,
+        },
+    )
+    changed = await client.get(
+        f'/users/{user.id}', headers={'If-None-Match': etag}
+    )
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.json()['username'] == 'renamed'
@@ -1,10 +1,14 @@
 from http import HTTPStatus
+from ipaddress import ip_network
 
+import pytest
 from freezegun import freeze_time
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from madr.data.models import Account
+from madr.utils import ratelimit
+from madr.utils.ratelimit import RateLimit
 
 
 async def test_get_token(client: AsyncClient, user: Account):
@@ -83,3 +87,89 @@ async def test_token_expired_dont_refresh(client: AsyncClient, user: Account):
 
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {'detail': 'Not authorized'}
+
+
+async def test_token_rate_limited_by_username_before_db_lookup(
+    client: AsyncClient,
+    user: Account,
+    monkeypatch: pytest.MonkeyPatch,
+    query_counter: list[str],
+):
+    monkeypatch.setattr(
+        ratelimit, 'LOGIN_BY_USERNAME', RateLimit('login-username', 1, 2)
+    )
+    data = {'username': user.email, 'password': 'wrong_password'}
+
+    for _ in range(2):
+        await client.post('/auth/token', data=data)
+    query_counter.clear()
+    response = await client.post(
+        '/auth/token', data={**data, 'username': user.email.upper()}
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.json() == {'detail': 'Too many login attempts'}
+    assert 0 < int(response.headers['retry-after']) <= 60  # noqa: PLR2004
+    assert query_counter == []
+
+
+async def test_token_rate_limited_by_client_ip(
+    client: AsyncClient, user: Account, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(ratelimit, 'LOGIN_BY_IP', RateLimit('login-ip', 1, 1))
+
+    first = await client.post(
+        '/auth/token', data={'username': 'a@test.com', 'password': 'x'}
+    )
+    second = await client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert first.status_code == HTTPStatus.BAD_REQUEST
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert 'retry-after' in second.headers
+
+
+async def test_token_rate_limited_by_forwarded_ip_behind_trusted_proxy(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(ratelimit, 'LOGIN_BY_IP', RateLimit('login-ip', 1, 1))
+    monkeypatch.setattr(
+        ratelimit, 'trusted_proxies', [ip_network('127.0.0.0/8')]
+    )
+    data = {'username': 'a@test.com', 'password': 'x'}
+
+    first = await client.post(
+        '/auth/token', data=data, headers={'X-Forwarded-For': '203.0.113.1'}
+    )
+    other_client = await client.post(
+        '/auth/token', data=data, headers={'X-Forwarded-For': '203.0.113.2'}
+    )
+    # A client can prepend hops, but the proxy appends the real address
+    spoofed = await client.post(
+        '/auth/token',
+        data=data,
+        headers={'X-Forwarded-For': '198.51.100.7, 203.0.113.1'},
+    )
+
+    assert first.status_code == HTTPStatus.BAD_REQUEST
+    assert other_client.status_code == HTTPStatus.BAD_REQUEST
+    assert spoofed.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+async def test_token_ignores_forwarded_ip_from_untrusted_peer(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(ratelimit, 'LOGIN_BY_IP', RateLimit('login-ip', 1, 1))
+    monkeypatch.setattr(ratelimit, 'trusted_proxies', [])
+    data = {'username': 'a@test.com', 'password': 'x'}
+
+    await client.post(
+        '/auth/token', data=data, headers={'X-Forwarded-For': '203.0.113.1'}
+    )
+    response = await client.post(
+        '/auth/token', data=data, headers={'X-Forwarded-For': '203.0.113.2'}
+    )
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
@@ -1,10 +1,25 @@
+import json
 from http import HTTPStatus
 
+import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from madr.app import app
+from madr.config.security import create_access_token
+from madr.data import database
+from madr.data.models import Account
 from madr.schemas.book import BookPublic
 from madr.schemas.novelist import NovelistPublic
+from madr.utils import serialization
+from madr.utils.cache import TTLCache
+from madr.utils.pagination import encode_cursor
+from madr.utils.response_cache import response_cache
 from tests.conftest import BookFactory
 
 
@@ -57,6 +72,55 @@ async def test_create_book_with_return_conflict(
     assert response.json() == {'detail': 'book already on the MADR'}
 
 
+async def test_create_book_conflicts_with_accent_and_case_variant(
+    client: AsyncClient, token: str, novelist: NovelistPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.post(
+        '/books/',
+        headers=headers,
+        json={
+            'title': 'Memórias Póstumas',
+            'year': '1881',
+            'author_id': novelist.id,
+        },
+    )
+
+    response = await client.post(
+        '/books/',
+        headers=headers,
+        json={
+            'title': '  MEMORIAS postumas ',
+            'year': '1881',
+            'author_id': novelist.id,
+        },
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'book already on the MADR'}
+
+
+async def test_create_book_conflicts_when_sanitized_titles_collide(
+    client: AsyncClient, token: str, novelist: NovelistPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.post(
+        '/books/',
+        headers=headers,
+        json={'title': 'Book', 'year': '1881', 'author_id': novelist.id},
+    )
+
+    # '™' is dropped from the stored title but folds to 'tm' on its own
+    response = await client.post(
+        '/books/',
+        headers=headers,
+        json={'title': 'Book™', 'year': '1881', 'author_id': novelist.id},
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'book already on the MADR'}
+
+
 async def test_list_books_with_return_empty_list(
     client: AsyncClient,
     token: str,
@@ -66,7 +130,7 @@ async def test_list_books_with_return_empty_list(
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'books': []}
+    assert response.json() == {'books': [], 'next_cursor': None}
 
 
 async def test_list_books_with_return_5_books(
@@ -139,7 +203,7 @@ async def test_list_books_filter_title_should_return_5(
     assert len(response.json()['books']) == expected_books
 
 
-async def test_list_books_filter_year_should_return_1(
+async def test_list_books_filter_year_should_return_5(
     client: AsyncClient,
     token: str,
     session: AsyncSession,
@@ -147,19 +211,198 @@ async def test_list_books_filter_year_should_return_1(
 ):
     expected_books = 5
 
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            *BookFactory.create_batch(5, author_id=novelist.id, year='1899'),
+            *BookFactory.create_batch(2, author_id=novelist.id, year='1900'),
+        ])
+    )
+    await session.commit()
+
+    response = await client.get(
+        '/books/?year=1899', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()['books']) == expected_books
+    assert {book['year'] for book in response.json()['books']} == {'1899'}
+
+
+async def test_list_books_filter_title_exact_ignores_accents_and_case(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    headers = {'Authorization': f'Bearer {token}'}
     await session.run_sync(
         lambda n: n.bulk_save_objects(
-            BookFactory.create_batch(5, author_id=novelist.id)
+            BookFactory.create_batch(3, author_id=novelist.id)
         )
     )
     await session.commit()
+    created = await client.post(
+        '/books/',
+        headers=headers,
+        json={
+            'title': 'Memórias Póstumas',
+            'year': '1881',
+            'author_id': novelist.id,
+        },
+    )
+
+    exact = await client.get(
+        '/books/',
+        params={'title_exact': ' MEMORIAS postumas'},
+        headers=headers,
+    )
+    partial = await client.get(
+        '/books/', params={'title_exact': 'memorias'}, headers=headers
+    )
+
+    assert exact.json()['books'] == [created.json()]
+    assert partial.json()['books'] == []
+
+
+async def test_list_books_filter_year_range(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(author_id=novelist.id, year=year)
+            for year in ('1857', '1881', '1899', '1900', '1937')
+        ])
+    )
+    await session.commit()
 
     response = await client.get(
-        '/books/?year=20', headers={'Authorization': f'Bearer {token}'}
+        '/books/?year_from=1881&year_to=1900',
+        headers={'Authorization': f'Bearer {token}'},
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert len(response.json()['books']) == expected_books
+    assert sorted(book['year'] for book in response.json()['books']) == [
+        '1881',
+        '1899',
+        '1900',
+    ]
+
+
+async def test_list_books_sorted_by_year_follows_cursor(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    years = ['1937', '1857', '1899', '1881', '1900']
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(author_id=novelist.id, year=year) for year in years
+        ])
+    )
+    await session.commit()
+
+    first = await client.get('/books/?sort=-year&limit=3', headers=headers)
+    cursor = first.json()['next_cursor']
+    second = await client.get(
+        f'/books/?sort=-year&limit=3&cursor={cursor}', headers=headers
+    )
+
+    assert [
+        book['year']
+        for page in (first, second)
+        for book in page.json()['books']
+    ] == sorted(years, reverse=True)
+    assert second.json()['next_cursor'] is None
+
+
+@pytest.mark.parametrize(
+    ('sort', 'values'),
+    [('year', ['abc', 1]), ('year', ['1900', 2**31]), ('id', [2**31])],
+)
+async def test_list_books_with_unbindable_cursor_return_bad_request(
+    client: AsyncClient, token: str, sort: str, values: list
+):
+    response = await client.get(
+        '/books/',
+        params={'sort': sort, 'cursor': encode_cursor(*values)},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+async def test_list_books_include_total_counts_every_page_once(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+    max_queries,
+):
+    expected_total = 5
+    headers = {'Authorization': f'Bearer {token}'}
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            *BookFactory.create_batch(5, author_id=novelist.id, year='1899'),
+            BookFactory(author_id=novelist.id, year='1900'),
+        ])
+    )
+    await session.commit()
+
+    first = await client.get(
+        '/books/?year=1899&limit=2&include_total=true', headers=headers
+    )
+    cursor = first.json()['next_cursor']
+    with max_queries(2):
+        second = await client.get(
+            f'/books/?year=1899&limit=2&include_total=true&cursor={cursor}',
+            headers=headers,
+        )
+
+    assert first.json()['total'] == expected_total
+    assert second.json()['total'] == expected_total
+
+
+async def test_list_books_estimated_total_uses_the_planner(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    expected_total = 3
+    headers = {'Authorization': f'Bearer {token}'}
+    await session.run_sync(
+        lambda n: n.bulk_save_objects(
+            BookFactory.create_batch(expected_total, author_id=novelist.id)
+        )
+    )
+    await session.execute(text('ANALYZE books'))
+    await session.commit()
+
+    estimated = await client.get(
+        '/books/?include_total=true&count_mode=estimated', headers=headers
+    )
+    uncounted = await client.get(
+        '/books/?include_total=true&count_mode=none', headers=headers
+    )
+
+    assert estimated.json()['total'] == expected_total
+    assert uncounted.json()['total'] is None
+
+
+async def test_list_books_filter_year_must_be_a_number(
+    client: AsyncClient, token: str
+):
+    response = await client.get(
+        '/books/?year_from=18th', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
 async def test_get_books_by_id_with_return_ok(
@@ -258,3 +501,359 @@ async def test_delete_book_with_return_not_found(
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Book not listed in MADR'}
+
+
+async def test_list_books_filter_title_should_match_wildcards_literally(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    session.add_all([
+        BookFactory(title='100% romance', author_id=novelist.id),
+        BookFactory(title='100 romances', author_id=novelist.id),
+    ])
+    await session.commit()
+
+    response = await client.get(
+        '/books/?title=100%25', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [b['title'] for b in response.json()['books']] == ['100% romance']
+
+
+async def test_list_books_cursor_pagination_walks_all_books(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    expected_books = 5
+
+    await session.run_sync(
+        lambda n: n.bulk_save_objects(
+            BookFactory.create_batch(5, author_id=novelist.id)
+        )
+    )
+    await session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {'limit': 2} | ({'cursor': cursor} if cursor else {})
+        response = await client.get(
+            '/books/',
+            params=params,
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        seen.extend(book['id'] for book in response.json()['books'])
+        cursor = response.json()['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(set(seen)) == expected_books
+
+
+async def test_import_books_with_return_per_row_report(
+    client: AsyncClient, token: str, novelist: NovelistPublic, book: BookPublic
+):
+    rows = [
+        {
+            'title': 'Memórias Póstumas',
+            'year': '1881',
+            'author_id': novelist.id,
+        },
+        {'title': 'Quincas Borba', 'year': 'abcd', 'author_id': novelist.id},
+        {'title': book.title, 'year': '1900', 'author_id': novelist.id},
+        {'title': 'Iracema', 'year': '1865', 'author_id': novelist.id + 99},
+        {'title': 'Helena', 'year': '3000', 'author_id': novelist.id},
+        {
+            'title': 'memórias póstumas',
+            'year': '1881',
+            'author_id': novelist.id,
+        },
+    ]
+    body = '\n'.join(json.dumps(row) for row in rows) + '\n{broken'
+
+    response = await client.post(
+        '/books/import',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'application/x-ndjson',
+        },
+        content=body,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['inserted'] == 1
+    assert {
+        (error['line'], error['detail'].split(':')[0])
+        for error in response.json()['errors']
+    } == {
+        (2, 'year'),
+        (3, 'book already on the MADR'),
+        (4, 'Novelist not listed in MADR'),
+        (5, 'year'),
+        (6, 'book already on the MADR'),
+        (7, 'Malformed row'),
+    }
+
+
+async def test_import_books_with_unsupported_media_type(
+    client: AsyncClient, token: str
+):
+    response = await client.post(
+        '/books/import',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'text/plain',
+        },
+        content='title,year,author_id\n',
+    )
+
+    assert response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+async def test_export_books_as_ndjson_with_author(
+    client: AsyncClient, token: str, novelist: NovelistPublic, book: BookPublic
+):
+    response = await client.get(
+        '/books/export?include_author=true',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {
+            'id': book.id,
+            'title': book.title,
+            'year': book.year,
+            'author_id': novelist.id,
+            'author': novelist.name,
+        }
+    ]
+
+
+async def test_export_books_as_csv(
+    client: AsyncClient, token: str, book: BookPublic
+):
+    response = await client.get(
+        '/books/export?format=csv',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.text.splitlines() == [
+        'id,title,year,author_id',
+        f'{book.id},{book.title},{book.year},{book.author_id}',
+    ]
+
+
+async def test_get_books_by_ids_reports_missing(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    books = BookFactory.create_batch(3, author_id=novelist.id)
+    session.add_all(books)
+    await session.commit()
+    ids = [books[2].id, 999, books[0].id]
+
+    response = await client.get(
+        '/books/batch',
+        params={'ids': ids},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [book['id'] for book in response.json()['books']] == ids[::2]
+    assert response.json()['missing'] == [999]
+
+
+async def test_post_books_by_ids_with_empty_list_return_unprocessable(
+    client: AsyncClient, token: str
+):
+    response = await client.post(
+        '/books/batch',
+        json={'ids': []},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+async def test_get_book_by_id_with_etag_return_not_modified(
+    client: AsyncClient, token: str, book: BookPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = await client.get(f'/books/{book.id}', headers=headers)
+    etag = response.headers['etag']
+
+    cached = await client.get(
+        f'/books/{book.id}', headers={**headers, 'If-None-Match': etag}
+    )
+    since = await client.get(
+        f'/books/{book.id}',
+        headers={
+            **headers,
+            'If-Modified-Since': response.headers['last-modified'],
+        },
+    )
+    await client.patch(
+        f'/books/{book.id}', headers=headers, json={'year': '1999'}
+    )
+    changed = await client.get(
+        f'/books/{book.id}', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert cached.headers['etag'] == etag
+    assert not cached.content
+    assert since.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.headers['etag'] != etag
+
+
+async def test_list_books_with_etag_return_not_modified(
+    client: AsyncClient, token: str, book: BookPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    response = await client.get('/books/', headers=headers)
+    etag = response.headers['etag']
+
+    cached = await client.get(
+        '/books/', headers={**headers, 'If-None-Match': etag}
+    )
+    await client.delete(f'/books/{book.id}', headers=headers)
+    changed = await client.get(
+        '/books/', headers={**headers, 'If-None-Match': etag}
+    )
+
+    assert 'last-modified' not in response.headers
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.json()['books'] == []
+
+
+async def test_list_books_served_from_cache_until_a_write(
+    client: AsyncClient,
+    token: str,
+    book: BookPublic,
+    query_counter: list[str],
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.get('/books/?limit=5', headers=headers)
+
+    query_counter.clear()
+    cached = await client.get('/books/?limit=05', headers=headers)
+    cached_queries = [q for q in query_counter if 'books' in q]
+
+    await client.patch(
+        f'/books/{book.id}', headers=headers, json={'year': '1999'}
+    )
+    listed = await client.get('/books/?limit=5', headers=headers)
+    detail = await client.get(f'/books/{book.id}', headers=headers)
+
+    assert cached.status_code == HTTPStatus.OK
+    assert cached_queries == []
+    assert listed.json()['books'][0]['year'] == '1999'
+    assert detail.json()['year'] == '1999'
+
+
+async def test_list_books_fast_json_matches_validated_output(
+    client: AsyncClient,
+    session: AsyncSession,
+    token: str,
+    novelist: NovelistPublic,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    session.add_all(
+        BookFactory.create_batch(3, author_id=novelist.id, year='1899')
+    )
+    await session.commit()
+    headers = {'Authorization': f'Bearer {token}'}
+
+    validated = await client.get('/books/?limit=2', headers=headers)
+    response_cache.clear()
+    monkeypatch.setattr(serialization.settings, 'FAST_JSON', True)
+    fast = await client.get('/books/?limit=2', headers=headers)
+
+    assert fast.status_code == HTTPStatus.OK
+    assert fast.headers['content-type'] == 'application/json'
+    assert fast.content == validated.content
+
+
+async def test_list_books_reads_replica_until_the_user_writes(  # noqa: PLR0913, PLR0917
+    client: AsyncClient,
+    engine: AsyncEngine,
+    token: str,
+    novelist: NovelistPublic,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    replica = create_async_engine(engine.url)
+    replica_queries = []
+    event.listen(
+        replica.sync_engine,
+        'before_cursor_execute',
+        lambda conn, cursor, statement, *args: replica_queries.append(
+            statement
+        ),
+    )
+    monkeypatch.setattr(database, 'engine', engine)
+    monkeypatch.setattr(database, 'read_engine', replica)
+    del app.dependency_overrides[database.get_async_read_session]
+    headers = {'Authorization': f'Bearer {token}'}
+
+    await client.get('/books/', headers=headers)
+    replica_reads = len(replica_queries)
+    created = await client.post(
+        '/books/',
+        headers=headers,
+        json={'title': 'Iracema', 'year': '1865', 'author_id': novelist.id},
+    )
+    listed = await client.get('/books/', headers=headers)
+    await replica.dispose()
+
+    assert replica_reads == 1
+    assert len(replica_queries) == replica_reads
+    assert listed.json()['books'] == [created.json()]
+
+
+async def test_post_books_batch_does_not_pin_reads_to_primary(
+    client: AsyncClient, token: str, user: Account, book: BookPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.post('/books/batch', headers=headers, json={'ids': [1]})
+    assert user.email not in database.recent_writers
+
+    await client.delete(f'/books/{book.id}', headers=headers)
+    assert user.email in database.recent_writers
+
+
+async def test_list_books_skips_caching_while_replica_may_lag(
+    client: AsyncClient,
+    token: str,
+    other_user: Account,
+    novelist: NovelistPublic,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(response_cache, 'recent_writes', TTLCache(8, 60))
+    other_token = create_access_token({'sub': other_user.email})
+    other_headers = {'Authorization': f'Bearer {other_token}'}
+    await client.get('/books/', headers=other_headers)
+    cached_before_write = len(response_cache.entries)
+
+    await client.post(
+        '/books/',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'title': 'Iracema', 'year': '1865', 'author_id': novelist.id},
+    )
+    await client.get('/books/', headers=other_headers)
+
+    assert cached_before_write == 1
+    assert len(response_cache.entries) == 0
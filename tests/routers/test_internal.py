@@ -0,0 +1,88 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from madr.config import security
+from madr.data import database
+from madr.routers import internal
+
+
+async def test_pool_stats_with_return_ok(
+    client: AsyncClient, internal_headers: dict
+):
+    response = await client.get('/internal/pool', headers=internal_headers)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['replica'] is None
+    assert set(response.json()['primary']) == {
+        'size',
+        'max_overflow',
+        'checked_out',
+        'idle',
+        'overflow',
+        'checkouts',
+        'checkout_timeouts',
+        'wait_time_seconds',
+    }
+
+
+async def test_pool_stats_report_the_replica_pool(
+    client: AsyncClient,
+    engine: AsyncEngine,
+    internal_headers: dict,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    replica = database.build_engine(engine.url)
+    monkeypatch.setattr(internal, 'read_engine', replica)
+
+    response = await client.get('/internal/pool', headers=internal_headers)
+    await replica.dispose()
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['replica']['checkouts'] == 0
+
+
+async def test_cache_stats_report_hits_and_memory(
+    client: AsyncClient, token: str, internal_headers: dict
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.get('/books/', headers=headers)
+    await client.get('/books/', headers=headers)
+
+    response = await client.get('/internal/cache', headers=internal_headers)
+    responses = response.json()['responses']
+
+    assert response.status_code == HTTPStatus.OK
+    assert responses['size'] == 1
+    assert responses['hits'] == responses['misses'] == 1
+    assert responses['hit_ratio'] == 1 / 2
+    assert responses['memory_bytes'] == len('{"books":[],"next_cursor":null}')
+    assert set(response.json()['users']) == {
+        'size',
+        'maxsize',
+        'hits',
+        'misses',
+        'hit_ratio',
+    }
+
+
+async def test_internal_endpoints_are_hidden_without_internal_token(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(security.settings, 'INTERNAL_TOKEN', None)
+    response = await client.get('/internal/pool')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+async def test_internal_endpoints_with_wrong_token_return_forbidden(
+    client: AsyncClient, internal_headers: dict
+):
+    response = await client.get(
+        '/internal/cache', headers={'X-Internal-Token': 'guess'}
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json() == {'detail': 'Not authorized'}
@@ -1,10 +1,15 @@
+import asyncio
+from collections import Counter
 from http import HTTPStatus
 
+import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from madr.data.bulk import MAX_LINE_BYTES
+from madr.schemas.book import BookPublic
 from madr.schemas.novelist import NovelistPublic
-from tests.conftest import NovelistFactory
+from tests.conftest import BookFactory, NovelistFactory
 
 
 async def test_create_novelist_with_return_created(client: AsyncClient, token):
@@ -39,7 +44,7 @@ async def test_list_novelist_with_return_empty_list(
     )
 
     assert response.status_code == HTTPStatus.OK
-    assert response.json() == {'novelists': []}
+    assert response.json() == {'novelists': [], 'next_cursor': None}
 
 
 async def test_list_novelist_with_return_5_novelist(
@@ -77,6 +82,45 @@ async def test_novelist_pagination_should_return_2(
     assert len(response.json()['novelists']) == expected_novelists
 
 
+async def test_list_novelist_include_total(
+    client: AsyncClient, session: AsyncSession, token: str
+):
+    expected_novelists = 2
+    expected_total = 5
+
+    await session.run_sync(
+        lambda n: n.bulk_save_objects(NovelistFactory.create_batch(5))
+    )
+    await session.commit()
+
+    response = await client.get(
+        '/novelist/?limit=2&include_total=true',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert len(response.json()['novelists']) == expected_novelists
+    assert response.json()['total'] == expected_total
+
+
+async def test_list_novelist_filter_name_exact(
+    client: AsyncClient, session: AsyncSession, token: str
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await session.run_sync(
+        lambda n: n.bulk_save_objects(NovelistFactory.create_batch(3))
+    )
+    await session.commit()
+    created = await client.post(
+        '/novelist/', headers=headers, json={'name': 'José de Alencar'}
+    )
+
+    response = await client.get(
+        '/novelist/', params={'name_exact': 'JOSE DE ALENCAR'}, headers=headers
+    )
+
+    assert response.json()['novelists'] == [created.json()]
+
+
 async def test_novelists_filter_name_should_return_5_novelists(
     client: AsyncClient, session: AsyncSession, token: str
 ):
@@ -156,6 +200,24 @@ async def test_update_novelist_return_conflict(
     assert response.json() == {'detail': 'novelist already on the MADR'}
 
 
+async def test_update_novelist_conflicts_with_accent_variant(
+    client: AsyncClient, token: str, novelist: NovelistPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.post(
+        '/novelist/', headers=headers, json={'name': 'José de Alencar'}
+    )
+
+    response = await client.patch(
+        f'/novelist/{novelist.id}',
+        json={'name': 'Jose de ALENCAR'},
+        headers=headers,
+    )
+
+    assert response.status_code == HTTPStatus.CONFLICT
+    assert response.json() == {'detail': 'novelist already on the MADR'}
+
+
 async def test_delete_novelist_with_return_ok(
     client: AsyncClient, token: str, novelist: NovelistPublic
 ):
@@ -177,3 +239,219 @@ async def test_delete_novelist_with_return_not_found(
 
     assert response.status_code == HTTPStatus.NOT_FOUND
     assert response.json() == {'detail': 'Novelist not listed in MADR'}
+
+
+async def test_list_novelist_with_invalid_cursor_return_bad_request(
+    client: AsyncClient, token: str
+):
+    response = await client.get(
+        '/novelist/?cursor=not-a-cursor',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+async def test_import_novelists_from_csv(
+    client: AsyncClient, token: str, novelist: NovelistPublic
+):
+    expected_inserted = 2
+    body = f'name\nMachado de Assis\n"Alencar, José de"\n{novelist.name}\n'
+
+    response = await client.post(
+        '/novelist/import',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'text/csv',
+        },
+        content=body,
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'inserted': expected_inserted,
+        'rejected': 1,
+        'errors': [{'line': 4, 'detail': 'novelist already on the MADR'}],
+    }
+
+
+async def test_import_novelists_skips_long_lines_and_byte_order_mark(
+    client: AsyncClient, token: str
+):
+    expected_inserted = 2
+    long_name = 'x' * (MAX_LINE_BYTES + 1)
+    body = f'\ufeffname\nMachado de Assis\n{long_name}\nJosé de Alencar\n'
+
+    async def chunks():
+        data = body.encode()
+        for start in range(0, len(data), 1024):
+            yield data[start : start + 1024]
+
+    response = await client.post(
+        '/novelist/import',
+        headers={
+            'Authorization': f'Bearer {token}',
+            'Content-Type': 'text/csv',
+        },
+        content=chunks(),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'inserted': expected_inserted,
+        'rejected': 1,
+        'errors': [{'line': 3, 'detail': f'Line over {MAX_LINE_BYTES} bytes'}],
+    }
+
+
+@pytest.mark.usefixtures('_session_per_request')
+async def test_create_novelist_concurrently_with_return_one_created(
+    client: AsyncClient, token: str
+):
+    parallel_requests = 10
+
+    responses = await asyncio.gather(
+        *(
+            client.post(
+                '/novelist/',
+                headers={'Authorization': f'Bearer {token}'},
+                json={'name': 'Clarice Lispector'},
+            )
+            for _ in range(parallel_requests)
+        )
+    )
+
+    assert Counter(response.status_code for response in responses) == {
+        HTTPStatus.CREATED: 1,
+        HTTPStatus.CONFLICT: parallel_requests - 1,
+    }
+
+
+async def test_post_novelists_by_ids_reports_missing(
+    client: AsyncClient,
+    token: str,
+    novelist: NovelistPublic,
+    other_novelist: NovelistPublic,
+):
+    response = await client.post(
+        '/novelist/batch',
+        json={'ids': [other_novelist.id, novelist.id, 42, novelist.id]},
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'novelists': [
+            {'id': other_novelist.id, 'name': other_novelist.name},
+            {'id': novelist.id, 'name': novelist.name},
+        ],
+        'missing': [42],
+    }
+
+
+async def test_get_novelist_by_id_include_books(
+    client: AsyncClient,
+    session: AsyncSession,
+    token: str,
+    novelist: NovelistPublic,
+):
+    book = BookFactory(year='1899', author_id=novelist.id)
+    session.add(book)
+    await session.commit()
+
+    response = await client.get(
+        f'/novelist/{novelist.id}?include=books',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': novelist.id,
+        'name': novelist.name,
+        'books': [
+            {
+                'id': book.id,
+                'title': book.title,
+                'year': book.year,
+                'author_id': novelist.id,
+            }
+        ],
+    }
+
+
+async def test_list_novelist_books_sorted_by_year_desc(
+    client: AsyncClient,
+    session: AsyncSession,
+    token: str,
+    novelist: NovelistPublic,
+    other_novelist: NovelistPublic,
+):
+    years = ['1881', '1899', '1872', '1891']
+    session.add_all(
+        [BookFactory(year=year, author_id=novelist.id) for year in years]
+        + [BookFactory(year='1900', author_id=other_novelist.id)]
+    )
+    await session.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {'sort': '-year', 'limit': 3}
+        response = await client.get(
+            f'/novelist/{novelist.id}/books',
+            params=params | ({'cursor': cursor} if cursor else {}),
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        seen.extend(book['year'] for book in response.json()['books'])
+        cursor = response.json()['next_cursor']
+        if cursor is None:
+            break
+
+    assert seen == sorted(years, reverse=True)
+
+
+async def test_list_novelist_books_with_return_not_found(
+    client: AsyncClient, token: str
+):
+    response = await client.get(
+        '/novelist/42/books', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Novelist not listed in MADR'}
+
+
+async def test_get_novelist_include_books_etag_follows_books(
+    client: AsyncClient, token: str, book: BookPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    url = f'/novelist/{book.author_id}?include=books'
+    response = await client.get(url, headers=headers)
+    etag = response.headers['etag']
+
+    cached = await client.get(url, headers={**headers, 'If-None-Match': etag})
+    await client.patch(
+        f'/books/{book.id}', headers=headers, json={'year': '1999'}
+    )
+    changed = await client.get(url, headers={**headers, 'If-None-Match': etag})
+
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed.status_code == HTTPStatus.OK
+    assert changed.json()['books'][0]['year'] == '1999'
+
+
+async def test_delete_novelist_invalidates_cached_books(
+    client: AsyncClient, token: str, book: BookPublic
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.get(f'/books/{book.id}', headers=headers)
+    await client.get('/novelist/', headers=headers)
+
+    await client.delete(f'/novelist/{book.author_id}', headers=headers)
+    detail = await client.get(f'/books/{book.id}', headers=headers)
+    listed = await client.get('/novelist/', headers=headers)
+
+    assert detail.status_code == HTTPStatus.NOT_FOUND
+    assert listed.json()['novelists'] == []
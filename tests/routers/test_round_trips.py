@@ -0,0 +1,134 @@
+from http import HTTPStatus
+
+import pytest
+from httpx import AsyncClient
+
+from madr.config.security import cache_user
+from madr.data.models import Account
+from madr.schemas.book import BookPublic
+from madr.schemas.novelist import NovelistPublic
+
+
+@pytest.mark.parametrize(
+    ('method', 'url', 'body', 'status', 'expected_queries'),
+    [
+        (
+            'POST',
+            '/books/',
+            {'title': 'Iracema', 'year': '1865', 'author_id': '{novelist}'},
+            HTTPStatus.CREATED,
+            1,
+        ),
+        (
+            'POST',
+            '/books/',
+            {'title': '{title}', 'year': '1900', 'author_id': '{novelist}'},
+            HTTPStatus.CONFLICT,
+            1,
+        ),
+        ('PATCH', '/books/{book}', {'year': '1999'}, HTTPStatus.OK, 1),
+        ('PATCH', '/books/999', {'year': '1999'}, HTTPStatus.NOT_FOUND, 1),
+        ('DELETE', '/books/{book}', None, HTTPStatus.OK, 1),
+        ('DELETE', '/books/999', None, HTTPStatus.NOT_FOUND, 1),
+        ('POST', '/novelist/', {'name': 'Alencar'}, HTTPStatus.CREATED, 1),
+        ('PATCH', '/novelist/{novelist}', {'name': 'x'}, HTTPStatus.OK, 1),
+        ('PATCH', '/novelist/999', {'name': 'x'}, HTTPStatus.NOT_FOUND, 1),
+        ('DELETE', '/novelist/{novelist}', None, HTTPStatus.OK, 1),
+        ('DELETE', '/novelist/999', None, HTTPStatus.NOT_FOUND, 1),
+        ('GET', '/books/batch?ids={book}&ids=999', None, HTTPStatus.OK, 1),
+        ('GET', '/novelist/batch?ids={novelist}', None, HTTPStatus.OK, 1),
+        ('GET', '/novelist/{novelist}/books', None, HTTPStatus.OK, 1),
+        ('GET', '/novelist/{novelist}?include=books', None, HTTPStatus.OK, 2),
+        (
+            'PUT',
+            '/users/{user}',
+            {
+                'username': 'renamed',
+                'email': 'renamed@test.com',
+                'password': 'x',
+            },
+            HTTPStatus.OK,
+            1,
+        ),
+        ('DELETE', '/users/{user}', None, HTTPStatus.OK, 1),
+    ],
+)
+async def test_endpoints_round_trips(  # noqa: PLR0913, PLR0917
+    client: AsyncClient,
+    token: str,
+    user: Account,
+    novelist: NovelistPublic,
+    book: BookPublic,
+    query_counter: list,
+    method: str,
+    url: str,
+    body: dict | None,
+    status: HTTPStatus,
+    expected_queries: int,
+):
+    values = {
+        'book': book.id,
+        'novelist': novelist.id,
+        'title': book.title,
+        'user': user.id,
+    }
+    if body:
+        body = {key: value.format(**values) for key, value in body.items()}
+    cache_user(user)
+    query_counter.clear()
+
+    response = await client.request(
+        method,
+        url.format(**values),
+        json=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == status
+    assert len(query_counter) == expected_queries, query_counter
+
+
+@pytest.mark.parametrize(
+    ('url', 'budget'),
+    [
+        ('/books/', 1),
+        ('/books/{book}', 1),
+        ('/books/export', 1),
+        ('/novelist/', 1),
+        ('/novelist/{novelist}', 1),
+        ('/novelist/{novelist}?include=books', 2),
+        ('/novelist/{novelist}/books', 1),
+        ('/users/', 1),
+        ('/users/{user}', 1),
+    ],
+)
+async def test_read_endpoints_query_budget(  # noqa: PLR0913, PLR0917
+    client: AsyncClient,
+    token: str,
+    user: Account,
+    book: BookPublic,
+    max_queries,
+    url: str,
+    budget: int,
+):
+    cache_user(user)
+    url = url.format(book=book.id, novelist=book.author_id, user=user.id)
+
+    with max_queries(budget):
+        response = await client.get(
+            url, headers={'Authorization': f'Bearer {token}'}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+async def test_login_query_budget(
+    client: AsyncClient, user: Account, max_queries
+):
+    with max_queries(1):
+        response = await client.post(
+            '/auth/token',
+            data={'username': user.email, 'password': user.clean_password},
+        )
+
+    assert response.status_code == HTTPStatus.OK
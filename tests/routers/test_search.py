@@ -0,0 +1,163 @@
+from http import HTTPStatus
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from madr.schemas.novelist import NovelistPublic
+from tests.conftest import BookFactory, NovelistFactory
+
+
+async def test_search_folds_accents_and_stems(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(
+                title='memórias póstumas de brás cubas', author_id=novelist.id
+            ),
+            BookFactory(title='dom casmurro', author_id=novelist.id),
+        ])
+    )
+    await session.commit()
+
+    response = await client.get(
+        '/search?q=memoria postuma',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    [hit] = response.json()['results']
+    assert hit['type'] == 'book'
+    assert hit['text'] == 'memórias póstumas de brás cubas'
+    assert hit['rank'] > 0
+    assert response.json()['next_cursor'] is None
+
+
+async def test_search_ranks_and_filters_by_type(
+    client: AsyncClient, token: str, session: AsyncSession
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            NovelistFactory(name='josé de alencar'),
+            NovelistFactory(name='alencar alencar'),
+        ])
+    )
+    await session.commit()
+
+    everything = await client.get('/search?q=alencar', headers=headers)
+    books = await client.get('/search?q=alencar&type=book', headers=headers)
+
+    assert [hit['text'] for hit in everything.json()['results']] == [
+        'alencar alencar',
+        'josé de alencar',
+    ]
+    assert books.json()['results'] == []
+
+
+async def test_search_follows_cursor(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(title=f'amor {number}', author_id=novelist.id)
+            for number in range(5)
+        ])
+    )
+    await session.commit()
+
+    first = await client.get('/search?q=amor&limit=3', headers=headers)
+    cursor = first.json()['next_cursor']
+    second = await client.get(
+        f'/search?q=amor&limit=3&cursor={cursor}', headers=headers
+    )
+
+    hits = [
+        hit['text']
+        for page in (first, second)
+        for hit in page.json()['results']
+    ]
+    assert sorted(hits) == [f'amor {number}' for number in range(5)]
+    assert second.json()['next_cursor'] is None
+
+
+async def test_search_requires_a_term(client: AsyncClient, token: str):
+    response = await client.get(
+        '/search?q=', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+async def test_autocomplete_suggests_titles_and_names_by_prefix(
+    client: AsyncClient, token: str, session: AsyncSession
+):
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            NovelistFactory(name='machado de assis'),
+            NovelistFactory(name='josé de alencar'),
+        ])
+    )
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(title='macunaíma', author_id=1),
+            BookFactory(title='dom casmurro', author_id=1),
+        ])
+    )
+    await session.commit()
+
+    response = await client.get(
+        '/autocomplete?q=MAC', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'suggestions': [
+            {'type': 'novelist', 'id': 1, 'text': 'machado de assis'},
+            {'type': 'book', 'id': 1, 'text': 'macunaíma'},
+        ]
+    }
+
+
+async def test_autocomplete_folds_accents_and_respects_limit(
+    client: AsyncClient,
+    token: str,
+    session: AsyncSession,
+    novelist: NovelistPublic,
+):
+    await session.run_sync(
+        lambda n: n.bulk_save_objects([
+            BookFactory(title=f'coração {number}', author_id=novelist.id)
+            for number in range(5)
+        ])
+    )
+    await session.commit()
+
+    response = await client.get(
+        '/autocomplete?q=coracao&limit=3',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert [hit['text'] for hit in response.json()['suggestions']] == [
+        'coração 0',
+        'coração 1',
+        'coração 2',
+    ]
+
+
+async def test_autocomplete_without_searchable_characters(
+    client: AsyncClient, token: str
+):
+    response = await client.get(
+        '/autocomplete?q=☕', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'suggestions': []}
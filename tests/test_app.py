@@ -8,3 +8,54 @@ async def test_read_root(client: AsyncClient):
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {'server': 'up'}
+
+
+async def test_metrics_label_requests_by_route_template(
+    client: AsyncClient, token: str, internal_headers: dict
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    await client.get('/books/1', headers=headers)
+    await client.get('/books/2', headers=headers)
+    await client.get('/missing')
+
+    response = await client.get('/metrics', headers=internal_headers)
+    body = response.text
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert (
+        'madr_http_requests_total{method="GET",route="/books/{book_id}",'
+        'status="404"} 2'
+    ) in body
+    assert (
+        'madr_http_requests_total{method="GET",route="<unmatched>",'
+        'status="404"} 1'
+    ) in body
+    assert (
+        'madr_http_request_duration_seconds_count'
+        '{method="GET",route="/books/{book_id}"} 2'
+    ) in body
+    assert (
+        'madr_http_response_size_bytes_bucket'
+        '{method="GET",route="/books/{book_id}",le="+Inf"} 2'
+    ) in body
+    assert 'madr_http_requests_in_flight 1' in body
+
+
+async def test_metrics_with_wrong_token_return_forbidden(
+    client: AsyncClient, internal_headers: dict
+):
+    response = await client.get(
+        '/metrics', headers={'X-Internal-Token': 'guess'}
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+async def test_responses_report_database_time(client: AsyncClient, token: str):
+    response = await client.get(
+        '/books/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.headers['server-timing'].startswith('db;dur=')
+    assert response.headers['server-timing'].endswith('desc="2 queries"')
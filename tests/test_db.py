@@ -1,6 +1,14 @@
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
 
+from madr.data.database import InstrumentedPool
+from madr.data.instrumentation import settings, track_queries
 from madr.data.models import Account
 
 
@@ -16,3 +24,69 @@ async def test_create_account(session: AsyncSession):
     )
 
     assert account.email == new_account.email
+
+
+async def test_instrumented_pool_reports_checkouts(engine: AsyncEngine):
+    pool_size = 2
+    pooled_engine = create_async_engine(
+        engine.url,
+        poolclass=InstrumentedPool,
+        pool_size=pool_size,
+        max_overflow=1,
+    )
+
+    async with pooled_engine.connect() as conn:
+        await conn.execute(text('SELECT 1'))
+        stats = pooled_engine.pool.stats()
+
+    await pooled_engine.dispose()
+
+    assert stats['checked_out'] == 1
+    assert stats['checkouts'] == 1
+    assert stats['size'] == pool_size
+
+
+async def test_track_queries_warns_on_repeated_statement_shape(
+    session: AsyncSession,
+    engine: AsyncEngine,
+    caplog: pytest.LogCaptureFixture,
+):
+    async with engine.connect() as conn:
+        with track_queries() as stats:
+            for account_id in range(settings.N_PLUS_ONE_THRESHOLD):
+                await conn.execute(
+                    select(Account).where(Account.id.in_([account_id, 0]))
+                )
+                await conn.execute(select(Account).where(Account.id == 1))
+
+    assert stats.count == 2 * settings.N_PLUS_ONE_THRESHOLD
+    assert stats.slowest_statement in stats.statements
+    assert 0 < stats.slowest_time <= stats.total_time
+    assert caplog.text.count('Possible N+1') == 2  # noqa: PLR2004
+
+
+async def test_slow_queries_are_logged(
+    engine: AsyncEngine,
+    caplog: pytest.LogCaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(settings, 'SLOW_QUERY_MS', 0)
+
+    async with engine.connect() as conn:
+        await conn.execute(text('SELECT pg_sleep(0.01)'))
+
+    assert 'Slow query' in caplog.text
+    assert 'pg_sleep' in caplog.text
+
+
+async def test_failed_statements_leave_no_timer_on_the_connection(
+    engine: AsyncEngine,
+):
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(DBAPIError):
+                await conn.execute(text('SELECT 1 / 0'))
+            await conn.rollback()
+        await conn.execute(text('SELECT 1'))
+
+        assert 'query_start' not in conn.info
@@ -5,12 +5,15 @@ from fastapi import HTTPException
 from freezegun import freeze_time
 from httpx import AsyncClient
 from jwt import decode
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
 from madr.config.security import (
     create_access_token,
     get_current_user,
     settings,
+    user_cache,
 )
 from madr.data.models import Account
 
@@ -82,3 +85,53 @@ async def test_token_expired_after_time(client: AsyncClient, user: Account):
 
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {'detail': 'Not authorized'}
+
+
+async def test_get_current_user_is_served_from_cache(
+    session: AsyncSession, user: Account
+):
+    token = create_access_token(data={'sub': user.email})
+
+    first = await get_current_user(session, token)
+    second = await get_current_user(session, token)
+
+    assert first.id == second.id == user.id
+    assert user_cache.stats()['misses'] == 1
+    assert user_cache.stats()['hits'] == 1
+
+
+async def test_update_account_evicts_cached_user(
+    client: AsyncClient, user: Account, token: str
+):
+    response = await client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'renamed',
+            'email': 'renamed@example.com',
+            'password': 'secret',
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = await client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert user.email not in user_cache
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+async def test_cached_user_keeps_every_column(
+    engine: AsyncEngine, user: Account
+):
+    token = create_access_token(data={'sub': user.email})
+
+    async with AsyncSession(engine) as session:
+        await get_current_user(session, token)
+    async with AsyncSession(engine) as session:
+        cached = await get_current_user(session, token)
+
+    assert user_cache.stats()['hits'] == 1
+    assert not inspect(cached).unloaded
+    assert cached.updated_at == user.updated_at
@@ -1,4 +1,4 @@
-from madr.utils.sanitize import sanitize_data
+from madr.utils.sanitize import normalize_key, sanitize_data
 
 
 def test_sanitize_data_removes_special_characters():
@@ -23,3 +23,9 @@ def test_sanitize_data_preserves_punctuation():
     input_data = 'Hello, World! How are you?'
     expected_output = 'hello, world! how are you?'
     assert sanitize_data(input_data) == expected_output
+
+
+def test_normalize_key_folds_accents():
+    input_data = '  Memórias   Póstumas de Brás Cubas! '
+    expected_output = 'memorias postumas de bras cubas!'
+    assert normalize_key(input_data) == expected_output